@@ -1,29 +1,133 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, stream_with_context
 import sys
 import os
 import json
-import random
 import datetime
+import atexit
+import csv
+import io
+import time
 from collections import defaultdict
 sys.path.append('src')
-from data_preprocessing import TextPreprocessor
-from model import SentimentModel
+from data_preprocessing import TextPreprocessor, iter_data_chunks
+from model_registry import ModelRegistry
+from micro_batcher import MicroBatcher
+from prediction_cache import PredictionCache
+from history_store import create_history_store, format_cursor, parse_cursor
 
 # Initialize Flask app
 app = Flask(__name__)
 
-# Load the preprocessor and model
-preprocessor = TextPreprocessor()
-model = SentimentModel(model_type='logistic_regression')
+# Load the preprocessor
+preprocessor = TextPreprocessor(lemma_cache_path='models/lemma_cache.json', lazy=True)
+
+# Model artifact to serve: a .pkl file or a directory exported with export_model.py --format mmap
+MODEL_PATH = os.environ.get('MODEL_PATH', 'models/best_sentiment_model.pkl')
+
+# Poll the artifact for changes every MODEL_WATCH_INTERVAL seconds (disabled when unset)
+MODEL_WATCH_INTERVAL = os.environ.get('MODEL_WATCH_INTERVAL')
+
+# Token required by /api/model/reload in the X-Admin-Token header (reloads are refused when unset)
+MODEL_ADMIN_TOKEN = os.environ.get('MODEL_ADMIN_TOKEN')
+
+# The registry serves the active model and swaps in new versions without a restart
+registry = ModelRegistry(MODEL_PATH)
 
 # Check if model is already trained
-if os.path.exists('models/best_sentiment_model.pkl'):
-    model.load_model('models/best_sentiment_model.pkl')
+if os.path.exists(MODEL_PATH):
+    registry.load()
 else:
     print("Model not found. Please train the model first using train_model.py.")
 
-# In-memory storage for reviews (in production, use a database)
-review_history = []
+if MODEL_WATCH_INTERVAL:
+    registry.watch(float(MODEL_WATCH_INTERVAL))
+
+# Concurrent /predict requests are scored together: up to MICRO_BATCH_MAX_SIZE reviews,
+# waiting at most MICRO_BATCH_MAX_WAIT_MS for the batch to fill. With MICRO_BATCHING=auto only
+# models without a compiled scorer are batched, since the compiled single-text path is faster
+# than a batched sklearn call ('always' and 'never' force the choice)
+MICRO_BATCHING = os.environ.get('MICRO_BATCHING', 'auto')
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', 32))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', 2))
+
+# Results of repeated reviews are served from a cache of PREDICTION_CACHE_SIZE entries
+# that expire after PREDICTION_CACHE_TTL seconds (a size of 0 disables the cache)
+prediction_cache = PredictionCache(max_entries=int(os.environ.get('PREDICTION_CACHE_SIZE', 100000)),
+                                   ttl_seconds=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)))
+
+def predict_reviews(review_texts, current=None):
+    """
+    Preprocess and score a batch of reviews with a single model version.
+
+    Cached results are looked up by raw text first and by preprocessed text second,
+    so only reviews that miss both are scored.
+
+    Parameters:
+    review_texts (list): Raw review texts
+    current (ModelVersion): Model version to score with (the active version if None)
+
+    Returns:
+    list: (prediction, score, score_type) for each review
+    """
+    if current is None:
+        current = registry.current()
+    model = current.model
+    results = [None] * len(review_texts)
+
+    # Exact duplicates skip preprocessing
+    uncached = []
+    for i, text in enumerate(review_texts):
+        raw_key = PredictionCache.key(text)
+        results[i] = prediction_cache.get(raw_key, current.version)
+        if results[i] is None:
+            uncached.append((i, raw_key))
+
+    # Near-duplicates skip scoring
+    to_score = []
+    for i, raw_key in uncached:
+        processed_text = preprocessor.preprocess_text(review_texts[i])
+        processed_key = PredictionCache.key(processed_text, 'processed')
+        results[i] = prediction_cache.get(processed_key, current.version)
+        if results[i] is None:
+            to_score.append((i, raw_key, processed_key, processed_text))
+        else:
+            prediction_cache.put(raw_key, results[i], current.version)
+
+    if not to_score:
+        return results
+
+    # A lone review is scored faster by the compiled single-text path
+    processed_texts = [processed_text for _, _, _, processed_text in to_score]
+    if len(processed_texts) == 1:
+        prediction, score = model.predict_with_score(processed_texts[0])
+        predictions, scores = [prediction], [score]
+    else:
+        predictions, scores = model.predict_batch(processed_texts, return_scores=True)
+
+    for (i, raw_key, processed_key, _), prediction, score in zip(to_score, predictions, scores):
+        results[i] = (prediction, float(score), model.score_type)
+        prediction_cache.put(raw_key, results[i], current.version)
+        prediction_cache.put(processed_key, results[i], current.version)
+    return results
+
+predict_batcher = MicroBatcher(predict_reviews, max_batch_size=MICRO_BATCH_MAX_SIZE,
+                               max_wait_ms=MICRO_BATCH_MAX_WAIT_MS)
+
+# Maximum number of reviews accepted by /api/predict_batch in one request
+MAX_BATCH_SIZE = 10000
+
+# Rows read, scored and written back at a time by /api/score_csv
+SCORE_CSV_CHUNK_SIZE = 5000
+
+# Review history: an SQLite database shared by all workers (HISTORY_STORE=memory keeps it in this process)
+HISTORY_STORE = os.environ.get('HISTORY_STORE', 'sqlite')
+HISTORY_DB_PATH = os.environ.get('HISTORY_DB_PATH', 'data/review_history.db')
+history_store = create_history_store(HISTORY_STORE, HISTORY_DB_PATH)
+atexit.register(history_store.close)
+
+# Page sizes of /api/history
+HISTORY_PAGE_SIZE = 50
+MAX_HISTORY_PAGE_SIZE = 500
 
 # Routes
 @app.route('/')
@@ -66,21 +170,20 @@ def insights_data():
     """
     Get insights data for charts.
     """
-    return jsonify({
-        'success': True,
-        'insights': {
-            'trend_data': {
-                'labels': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-                'positive': [65, 68, 66, 70, 68, 72],
-                'negative': [35, 32, 34, 30, 32, 28]
-            },
-            'category_data': {
-                'labels': ['Electronics', 'Books', 'Clothing', 'Home & Kitchen', 'Sports', 'Toys'],
-                'positive': [72, 68, 65, 70, 58, 75],
-                'negative': [28, 32, 35, 30, 42, 25]
+    try:
+        insights = history_store.insights()
+        return jsonify({
+            'success': True,
+            'insights': {
+                'trend_data': insights['trend_data'],
+                'category_data': insights['category_data']
             }
-        }
-    })
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
 @app.route('/predict', methods=['POST'])
 def predict():
@@ -106,38 +209,37 @@ def predict():
                     'error': 'Review text cannot be empty'
                 }), 400
 
-            # Preprocess the text
-            processed_text = preprocessor.preprocess_text(review_text)
-
-            # Make prediction
+            # Preprocess and score the text, batched together with other concurrent requests if enabled
             try:
-                prediction = model.predict(processed_text)
+                if MICRO_BATCHING == 'always' or (MICRO_BATCHING == 'auto' and registry.current().model.scorer is None):
+                    prediction, score, score_type = predict_batcher.submit(review_text)
+                else:
+                    prediction, score, score_type = predict_reviews([review_text])[0]
                 print(f"Raw prediction: {prediction}")  # Debug line
 
                 # Convert prediction to sentiment
                 sentiment = 'Positive' if prediction == 1 else 'Negative'
                 print(f"Converted sentiment: {sentiment}")  # Debug line
 
-                # Generate a confidence score (simulated)
-                confidence = round(random.uniform(0.7, 0.95), 2)
+                # Probability of the predicted class (decision margin for models without probabilities)
+                confidence = round(float(score), 4)
 
                 # Save to history
-                review_entry = {
-                    'id': len(review_history) + 1,
+                review_entry = history_store.add({
                     'text': review_text,
                     'category': category,
                     'rating': rating,
                     'sentiment': sentiment,
                     'confidence': confidence,
                     'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                review_history.append(review_entry)
+                })
 
                 # Return the result as JSON
                 result = {
                     'success': True,
                     'sentiment': sentiment,
                     'confidence': confidence,
+                    'confidence_type': score_type,
                     'review': review_entry,
                     'sentiment_text': sentiment  # Explicitly add sentiment_text for frontend
                 }
@@ -162,15 +264,49 @@ def predict():
             'error': str(e)
         }), 500
 
-@app.route('/api/history')
-def get_history():
+@app.route('/api/predict_batch', methods=['POST'])
+def predict_batch():
     """
-    Get review history as JSON.
+    Predict sentiment for a batch of reviews sent as JSON: {"texts": [...]}.
     """
     try:
+        payload = request.get_json(silent=True) or {}
+        texts = payload.get('texts')
+
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            return jsonify({
+                'success': False,
+                'error': 'Expected a JSON body with a "texts" list of strings'
+            }), 400
+
+        if len(texts) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'Batch too large: {len(texts)} reviews (maximum {MAX_BATCH_SIZE})'
+            }), 413
+
+        try:
+            # Score the batch and label its scores with one model version, even if a reload happens meanwhile
+            current = registry.current()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
+
+        # Preprocess every uncached review, then vectorize and score them in one pass
+        results = []
+        for prediction, score, score_type in predict_reviews(texts, current=current):
+            results.append({
+                'sentiment': 'Positive' if prediction == 1 else 'Negative',
+                'confidence': round(score, 4)
+            })
+
         return jsonify({
             'success': True,
-            'history': review_history
+            'count': len(results),
+            'confidence_type': current.model.score_type,
+            'results': results
         })
     except Exception as e:
         return jsonify({
@@ -178,14 +314,203 @@ def get_history():
             'error': str(e)
         }), 500
 
+@app.route('/api/score_csv', methods=['POST'])
+def score_csv():
+    """
+    Score a CSV file of reviews (Rating,Title,Text without a header, as read by load_data).
+
+    The file is sent as the request body (Content-Type: text/csv) or as the "file"
+    field of a multipart form. It is read and scored SCORE_CSV_CHUNK_SIZE rows at a
+    time and the results are streamed back while the rest is still being processed,
+    so memory use does not grow with the file size. ?format=ndjson (default) returns
+    one JSON object per line with start, result, progress and done records;
+    ?format=csv returns row,rating,sentiment,confidence rows.
+    """
+    output_format = request.args.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({
+            'success': False,
+            'error': "format must be 'ndjson' or 'csv'"
+        }), 400
+
+    try:
+        # Score the whole file with one model version, even if a reload happens meanwhile
+        current = registry.current()
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+
+    # Multipart uploads are spooled to a temporary file by Werkzeug; raw bodies are read straight from the socket
+    if request.content_type and request.content_type.startswith('multipart/form-data'):
+        if 'file' not in request.files:
+            return jsonify({
+                'success': False,
+                'error': 'Missing file field'
+            }), 400
+        # Flask closes uploaded files when the view returns, before the response is streamed,
+        # so take the spooled file over and close it once scoring is done
+        upload = request.files['file']
+        source, upload.stream = upload.stream, io.BytesIO()
+    else:
+        source = request.stream
+
+    model = current.model
+
+    def generate():
+        start_time = time.time()
+        n_rows = 0
+        if output_format == 'ndjson':
+            yield json.dumps({'type': 'start', 'model_version': current.version,
+                              'confidence_type': model.score_type}) + '\n'
+        else:
+            yield 'row,rating,sentiment,confidence\n'
+
+        try:
+            for chunk in iter_data_chunks(source, chunksize=SCORE_CSV_CHUNK_SIZE):
+                if chunk.empty:
+                    continue
+                processed_texts = [preprocessor.preprocess_text(text) for text in chunk['Text'].fillna('').astype(str)]
+                predictions, scores = model.predict_batch(processed_texts, return_scores=True)
+                # Missing ratings make the column float64: write them as null and the rest as ints
+                ratings = chunk['Rating'].astype('Int64').astype(object)
+                ratings = ratings.where(ratings.notna(), None).tolist()
+
+                output = io.StringIO()
+                writer = csv.writer(output, lineterminator='\n') if output_format == 'csv' else None
+                for offset, (rating, prediction, score) in enumerate(zip(ratings, predictions, scores)):
+                    row = [n_rows + offset + 1, rating, 'Positive' if prediction == 1 else 'Negative', round(float(score), 4)]
+                    if writer is not None:
+                        writer.writerow(row)
+                    else:
+                        output.write(json.dumps({'type': 'result', 'row': row[0], 'rating': row[1],
+                                                 'sentiment': row[2], 'confidence': row[3]}) + '\n')
+                n_rows += len(chunk)
+
+                if output_format == 'ndjson':
+                    elapsed = time.time() - start_time
+                    output.write(json.dumps({'type': 'progress', 'rows': n_rows, 'elapsed_seconds': round(elapsed, 2),
+                                             'rows_per_second': round(n_rows / elapsed, 1) if elapsed else None}) + '\n')
+                yield output.getvalue()
+        except Exception as e:
+            # Headers are already sent, so errors are reported in the stream itself
+            print(f"Error scoring CSV upload after {n_rows} rows: {e}")
+            if output_format == 'ndjson':
+                yield json.dumps({'type': 'error', 'rows': n_rows, 'error': str(e)}) + '\n'
+            else:
+                yield f'# error after {n_rows} rows: {e}\n'
+            return
+
+        finally:
+            source.close()
+
+        if output_format == 'ndjson':
+            yield json.dumps({'type': 'done', 'rows': n_rows, 'elapsed_seconds': round(time.time() - start_time, 2)}) + '\n'
+
+    mimetype = 'application/x-ndjson' if output_format == 'ndjson' else 'text/csv'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+def parse_history_filters(args):
+    """
+    Read the /api/history filters from the query string.
+
+    Parameters:
+    args (werkzeug.datastructures.MultiDict): Query string arguments
+
+    Returns:
+    dict: Filters for the history store
+
+    Raises:
+    ValueError: If a filter value is invalid
+    """
+    filters = {}
+
+    sentiment = args.get('sentiment')
+    if sentiment:
+        if sentiment not in ('Positive', 'Negative'):
+            raise ValueError("sentiment must be 'Positive' or 'Negative'")
+        filters['sentiment'] = sentiment
+
+    if args.get('category'):
+        filters['category'] = args['category']
+    if args.get('q'):
+        filters['search'] = args['q']
+
+    # Dates are inclusive calendar days, compared against the stored "%Y-%m-%d %H:%M:%S" timestamps
+    for name, key, offset in [('start_date', 'start', 0), ('end_date', 'end', 1)]:
+        if args.get(name):
+            try:
+                day = datetime.datetime.strptime(args[name], "%Y-%m-%d") + datetime.timedelta(days=offset)
+            except ValueError:
+                raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+            filters[key] = day.strftime("%Y-%m-%d %H:%M:%S")
+
+    return filters
+
+@app.route('/api/history')
+def get_history():
+    """
+    Get one page of review history as JSON, newest first.
+
+    Query parameters: sentiment, category, q (text search), start_date and end_date
+    (YYYY-MM-DD), limit (page size, at most MAX_HISTORY_PAGE_SIZE) and cursor
+    (the next_cursor of the previous page). The first page also carries a summary
+    of all matching reviews. Responses carry an ETag that only changes when the
+    history changes, so unchanged pages are answered with 304 Not Modified.
+    """
+    try:
+        try:
+            filters = parse_history_filters(request.args)
+            limit = int(request.args.get('limit', HISTORY_PAGE_SIZE))
+            cursor = request.args.get('cursor')
+            cursor = parse_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        limit = max(1, min(limit, MAX_HISTORY_PAGE_SIZE))
+
+        # The revision is read before the page, so a concurrent write can only make the ETag stale, never the page
+        etag = f"history-{history_store.revision()}"
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        history, next_cursor = history_store.query(cursor=cursor, limit=limit, **filters)
+        result = {
+            'success': True,
+            'history': history,
+            'next_cursor': format_cursor(next_cursor) if next_cursor else None
+        }
+        if cursor is None:
+            result['summary'] = history_store.summarize(**filters)
+
+        response = jsonify(result)
+        response.set_etag(etag)
+        # Let browsers keep the page but revalidate it on every request
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/history/<int:review_id>', methods=['DELETE'])
 def delete_review(review_id):
     """
     Delete a review from history.
     """
     try:
-        global review_history
-        review_history = [r for r in review_history if r['id'] != review_id]
+        if not history_store.delete(review_id):
+            return jsonify({
+                'success': False,
+                'error': 'Review not found'
+            }), 404
+
         return jsonify({
             'success': True,
             'message': 'Review deleted successfully'
@@ -223,6 +548,9 @@ def get_model_info():
                     elif line.startswith('Max features:'):
                         model_info['max_features'] = int(line.split(': ')[1])
 
+        # Version of the model currently serving predictions
+        model_info['registry'] = registry.info()
+
         return jsonify({
             'success': True,
             'model_info': model_info
@@ -233,29 +561,71 @@ def get_model_info():
             'error': str(e)
         }), 500
 
+@app.route('/api/model/reload', methods=['POST'])
+def reload_model():
+    """
+    Load a new model artifact in the background and swap it in once it is warmed up.
+    Accepts an optional JSON body: {"model_path": "..."}.
+    """
+    try:
+        if not MODEL_ADMIN_TOKEN or request.headers.get('X-Admin-Token') != MODEL_ADMIN_TOKEN:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid or missing admin token'
+            }), 403
+
+        payload = request.get_json(silent=True) or {}
+        model_path = payload.get('model_path')
+        if model_path is not None and not os.path.exists(model_path):
+            return jsonify({
+                'success': False,
+                'error': f'Model artifact not found: {model_path}'
+            }), 400
+
+        if not registry.reload_async(model_path):
+            return jsonify({
+                'success': False,
+                'error': 'A reload is already in progress'
+            }), 409
+
+        return jsonify({
+            'success': True,
+            'message': 'Reload started',
+            'registry': registry.info()
+        }), 202
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/metrics')
+def get_metrics():
+    """
+    Get serving metrics as JSON.
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'metrics': {
+                'micro_batching': {'mode': MICRO_BATCHING, **predict_batcher.stats()},
+                'prediction_cache': prediction_cache.stats()
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/insights')
 def get_insights():
     """
     Get sentiment insights as JSON.
     """
     try:
-        # Generate mock insights data
-        insights = {
-            'total_reviews': len(review_history) if review_history else 2400000,
-            'positive_percentage': 68,
-            'negative_percentage': 32,
-            'average_rating': 4.2,
-            'trend_data': {
-                'labels': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-                'positive': [65, 68, 66, 70, 68, 72],
-                'negative': [35, 32, 34, 30, 32, 28]
-            },
-            'category_data': {
-                'labels': ['Electronics', 'Books', 'Clothing', 'Home & Kitchen', 'Sports', 'Toys'],
-                'positive': [72, 68, 65, 70, 58, 75],
-                'negative': [28, 32, 35, 30, 42, 25]
-            }
-        }
+        # Aggregates are maintained as reviews are recorded, so this never scans the history
+        insights = history_store.insights()
 
         return jsonify({
             'success': True,
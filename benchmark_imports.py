@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+# Modules the serving process must not import at startup
+LAZY_MODULES = ['nltk', 'sklearn.ensemble', 'sklearn.naive_bayes']
+
+# Runs in a fresh interpreter: imports the module and reports its wall time and loaded modules
+CHILD_SCRIPT = """
+import json, sys, time
+sys.path.append('src')
+start_time = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start_time
+print(json.dumps({{'elapsed': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+def measure_import(module, repo_dir):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Parameters:
+    module (str): Module to import
+    repo_dir (str): Working directory of the child process
+
+    Returns:
+    tuple: (wall time in seconds, loaded module names, self time in microseconds per top-level package)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT.format(module=module)],
+        cwd=repo_dir, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    # stderr lines look like: "import time:   self [us] | cumulative | imported package"
+    package_times = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        package_times[name.strip().split('.')[0]] += int(self_time)
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report['elapsed'], set(report['modules']), package_times
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Measure the cold import cost of the serving process')
+    parser.add_argument('--module', type=str, default='app', help='Module to import (default: the Flask app)')
+    parser.add_argument('--budget_ms', type=float, default=4000, help='Maximum allowed import wall time in milliseconds')
+    parser.add_argument('--top', type=int, default=15, help='Number of packages to list')
+
+    args = parser.parse_args()
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    elapsed, modules, package_times = measure_import(args.module, repo_dir)
+
+    print(f"Import cost of '{args.module}' by top-level package (self time):")
+    for package, self_time in sorted(package_times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:<30}{self_time / 1000:>10.1f} ms")
+    print(f"Total wall time: {elapsed * 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    eager_modules = [name for name in LAZY_MODULES if name in modules]
+    failed = False
+    if eager_modules:
+        print(f"Modules that should be imported lazily were loaded: {', '.join(eager_modules)}")
+        failed = True
+    if elapsed * 1000 > args.budget_ms:
+        print("Import time is over budget")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("Import time within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+sys.path.append('src')
+
+# Ways of loading the training columns, each measured in a fresh process
+READERS = {
+    'csv': 'CSV, all columns (previous loader)',
+    'csv_projected': 'CSV, Rating and Text only',
+    'parquet': 'Parquet, Rating and Text only'
+}
+
+def read_training_columns(reader, path, chunksize, max_rows):
+    """
+    Load the Rating and Text columns the way a training script does.
+
+    Parameters:
+    reader (str): Key of READERS
+    path (str): Data file for the reader
+    chunksize (int): Number of rows per chunk
+    max_rows (int): Maximum number of rows to load
+
+    Returns:
+    pandas.DataFrame: Loaded rows
+    """
+    import pandas as pd
+    from data_preprocessing import iter_data_chunks
+
+    if reader == 'csv':
+        chunks = []
+        for chunk in pd.read_csv(path, header=None, chunksize=chunksize):
+            chunk.columns = ['Rating', 'Title', 'Text']
+            chunks.append(chunk)
+            if sum(len(c) for c in chunks) >= max_rows:
+                break
+        return pd.concat(chunks, ignore_index=True).iloc[:max_rows]
+
+    chunks = iter_data_chunks(path, chunksize=chunksize, columns=['Rating', 'Text'], max_rows=max_rows)
+    return pd.concat(chunks, ignore_index=True)
+
+def measure(reader, path, chunksize, max_rows):
+    """
+    Measure one reader in a fresh interpreter so peak memory is not shared between readers.
+
+    Returns:
+    dict: Rows loaded, seconds and peak resident memory in MB
+    """
+    result = subprocess.run(
+        [sys.executable, __file__, '--measure', reader, '--path', path,
+         '--chunksize', str(chunksize), '--max_rows', str(max_rows)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring {reader} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Compare parse time and peak memory of CSV and Parquet training data')
+    parser.add_argument('--csv_path', type=str, help='Path to the CSV data file (Rating,Title,Text)')
+    parser.add_argument('--parquet_path', type=str, help='Path to the same data converted with ingest_data.py')
+    parser.add_argument('--chunksize', type=int, default=100000, help='Number of rows per chunk')
+    parser.add_argument('--max_rows', type=int, default=2000000, help='Maximum number of rows to load')
+    parser.add_argument('--measure', type=str, choices=list(READERS), help=argparse.SUPPRESS)
+    parser.add_argument('--path', type=str, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    # Child process: load once and report
+    if args.measure:
+        start_time = time.perf_counter()
+        df = read_training_columns(args.measure, args.path, args.chunksize, args.max_rows)
+        elapsed = time.perf_counter() - start_time
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(json.dumps({'rows': len(df), 'seconds': elapsed, 'peak_mb': peak_mb}))
+        return
+
+    if not args.csv_path or not args.parquet_path:
+        parser.error('--csv_path and --parquet_path are required')
+
+    paths = {'csv': args.csv_path, 'csv_projected': args.csv_path, 'parquet': args.parquet_path}
+    print(f"{'Reader':<36}{'Rows':>10}{'Seconds':>10}{'Peak MB':>10}")
+    for reader, label in READERS.items():
+        result = measure(reader, paths[reader], args.chunksize, args.max_rows)
+        print(f"{label:<36}{result['rows']:>10}{result['seconds']:>10.2f}{result['peak_mb']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor
+
+# Pipelines compared, each run in a fresh process
+PIPELINES = {
+    'copying': 'Copying (apply labels, df.copy per step and batch)',
+    'in_place': 'In place (vectorized category/int8 labels)'
+}
+
+# Vocabulary of the generated reviews
+WORDS = ('great good bad terrible product quality price shipping battery screen sound works broke '
+         'love hate return refund recommend never again cheap sturdy flimsy comfortable size fits '
+         'perfect disappointed excellent poor fast slow easy hard use month week day after before').split()
+
+def generate_data(path, n_rows, words_per_review, seed=42, chunksize=100000):
+    """
+    Write a reproducible Parquet file of random reviews, one chunk at a time.
+
+    Parameters:
+    path (str): Path of the Parquet file
+    n_rows (int): Number of reviews
+    words_per_review (int): Average number of words per review
+    seed (int): Random seed
+    chunksize (int): Number of reviews generated at a time
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(WORDS)
+    schema = pa.schema([('Rating', pa.int8()), ('Text', pa.string())])
+
+    tmp_path = f"{path}.tmp"
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for start in range(0, n_rows, chunksize):
+            size = min(chunksize, n_rows - start)
+            lengths = rng.integers(words_per_review // 2, words_per_review * 3 // 2, size=size)
+            words = vocabulary[rng.integers(0, len(vocabulary), size=int(lengths.sum()))]
+            offsets = np.concatenate([[0], np.cumsum(lengths)])
+            texts = [' '.join(words[offsets[i]:offsets[i + 1]]) for i in range(size)]
+            ratings = rng.integers(1, 3, size=size).astype(np.int8)
+            writer.write_table(pa.Table.from_arrays([pa.array(ratings), pa.array(texts)], schema=schema))
+    os.replace(tmp_path, path)
+
+def copying_pipeline(df, batch_size):
+    """
+    Labeling and preprocessing as the training scripts did before: two copies and
+    two apply passes for the labels, then a copy of every batch and of its frame.
+    """
+    import pandas as pd
+
+    df_copy = df.copy()
+    df_copy['sentiment'] = df_copy['Rating'].apply(lambda x: 'negative' if x == 1 else 'positive')
+    df_copy['sentiment_binary'] = df_copy['sentiment'].apply(lambda x: 0 if x == 'negative' else 1)
+    df_labeled = df_copy.copy()
+
+    processed_chunks = []
+    for i in range(0, len(df_labeled), batch_size):
+        batch = df_labeled.iloc[i:i + batch_size].copy()
+        batch_copy = batch.copy()
+        batch_copy['Text_processed'] = batch_copy['Text'].apply(preprocess_text)
+        processed_chunks.append(batch_copy)
+    return pd.concat(processed_chunks, ignore_index=True)
+
+def in_place_pipeline(df, batch_size):
+    """
+    Labeling and preprocessing as the training scripts do now.
+    """
+    from data_preprocessing import create_sentiment_labels
+
+    df_labeled = create_sentiment_labels(df, 'Rating', 'Text', inplace=True)
+    return StandInPreprocessor(lazy=True).preprocess_dataframe(df_labeled, 'Text', chunk_size=batch_size, inplace=True)
+
+def preprocess_text(text):
+    """
+    Stand-in for TextPreprocessor.preprocess_text: returns a new string of similar
+    size without the NLTK cost, so the benchmark measures the dataframe plumbing.
+    """
+    return text.lower()
+
+class StandInPreprocessor(TextPreprocessor):
+    """
+    TextPreprocessor using the stand-in preprocess_text.
+    """
+
+    def preprocess_text(self, text):
+        return preprocess_text(text)
+
+def current_rss_mb():
+    """
+    Get the current resident memory of this process in MB (Linux only).
+    """
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+def run_child(*child_args):
+    """
+    Run this script in a fresh interpreter. The parent stays small because a child
+    process starts with the peak memory of its parent as its own ru_maxrss.
+
+    Returns:
+    str: Last line printed by the child
+    """
+    result = subprocess.run([sys.executable, __file__, *child_args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Running {' '.join(child_args)} failed:\n{result.stderr}")
+    output = result.stdout.strip().splitlines()
+    return output[-1] if output else ''
+
+def measure(pipeline, path, batch_size):
+    """
+    Run one pipeline in a fresh interpreter so peak memory is not shared between runs.
+
+    Returns:
+    dict: Seconds, resident memory after loading and peak resident memory in MB
+    """
+    return json.loads(run_child('--measure', pipeline, '--path', path, '--batch_size', str(batch_size)))
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Measure peak memory of sentiment labeling and preprocessing')
+    parser.add_argument('--sizes', type=str, default='100000,1000000,2000000', help='Comma-separated row counts')
+    parser.add_argument('--words_per_review', type=int, default=60, help='Average number of words per generated review')
+    parser.add_argument('--batch_size', type=int, default=100000, help='Batch size for processing data')
+    parser.add_argument('--data_dir', type=str, default='data/cache', help='Directory for the generated data files')
+    parser.add_argument('--measure', type=str, choices=list(PIPELINES), help=argparse.SUPPRESS)
+    parser.add_argument('--path', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--generate', type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    # Child process: write the data file
+    if args.generate:
+        generate_data(args.path, args.generate, args.words_per_review)
+        return
+
+    # Child process: load, run one pipeline and report
+    if args.measure:
+        import pandas as pd
+
+        df = pd.read_parquet(args.path)
+        loaded_mb = current_rss_mb()
+        pipeline = copying_pipeline if args.measure == 'copying' else in_place_pipeline
+        start_time = time.perf_counter()
+        df_processed = pipeline(df, args.batch_size)
+        elapsed = time.perf_counter() - start_time
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(json.dumps({'rows': len(df_processed), 'seconds': elapsed, 'loaded_mb': loaded_mb, 'peak_mb': peak_mb}))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    print(f"{'Rows':>10}  {'Pipeline':<52}{'Seconds':>9}{'Loaded MB':>11}{'Peak MB':>9}{'Extra MB':>10}")
+    for n_rows in [int(size) for size in args.sizes.split(',')]:
+        path = os.path.join(args.data_dir, f'benchmark_memory_{n_rows}_{args.words_per_review}.parquet')
+        if not os.path.exists(path):
+            print(f"Generating {n_rows} reviews in {path}...")
+            run_child('--generate', str(n_rows), '--path', path, '--words_per_review', str(args.words_per_review))
+
+        for pipeline, label in PIPELINES.items():
+            result = measure(pipeline, path, args.batch_size)
+            extra_mb = result['peak_mb'] - result['loaded_mb']
+            print(f"{n_rows:>10}  {label:<52}{result['seconds']:>9.2f}{result['loaded_mb']:>11.1f}"
+                  f"{result['peak_mb']:>9.1f}{extra_mb:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor
+from model import SentimentModel
+from micro_batcher import MicroBatcher
+
+def run_load(predict, texts, concurrency):
+    """
+    Send every text through predict from several client threads.
+
+    Parameters:
+    predict (callable): Scores one raw review
+    texts (list): Raw review texts
+    concurrency (int): Number of client threads
+
+    Returns:
+    tuple: (requests per second, per-request latencies in milliseconds)
+    """
+    latencies = [[] for _ in range(concurrency)]
+
+    def client(worker_id):
+        for text in texts[worker_id::concurrency]:
+            start_time = time.perf_counter()
+            predict(text)
+            latencies[worker_id].append((time.perf_counter() - start_time) * 1000)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+
+    return len(texts) / elapsed, np.concatenate([np.array(l) for l in latencies])
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Benchmark micro-batched scoring of concurrent single-review requests')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV data file (Rating,Title,Text)')
+    parser.add_argument('--model_path', type=str, default='models/best_sentiment_model.pkl', help='Path to the trained model')
+    parser.add_argument('--num_samples', type=int, default=5000, help='Number of reviews to send')
+    parser.add_argument('--concurrency', type=int, default=32, help='Number of concurrent clients')
+    parser.add_argument('--max_batch_size', type=int, default=32, help='Maximum micro-batch size')
+    parser.add_argument('--no_compiled_scorer', action='store_true',
+                        help='Score single reviews through sklearn, as for models the compiled scorer does not support')
+    parser.add_argument('--wait_ms', type=float, nargs='+', default=[0, 1, 2, 5], help='max_wait_ms settings to compare')
+
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data_path, header=None, names=['Rating', 'Title', 'Text'], nrows=args.num_samples)
+    texts = df['Text'].fillna('').astype(str).tolist()
+
+    preprocessor = TextPreprocessor()
+    model = SentimentModel()
+    model.load_model(args.model_path)
+    if args.no_compiled_scorer:
+        model.scorer = None
+
+    def predict_reviews(review_texts):
+        processed_texts = [preprocessor.preprocess_text(text) for text in review_texts]
+        predictions, scores = model.predict_batch(processed_texts, return_scores=True)
+        return list(zip(predictions, scores))
+
+    # Warm up the lemma cache so every run sees the same preprocessing cost
+    predict_reviews(texts)
+
+    def predict_single(text):
+        return model.predict_with_score(preprocessor.preprocess_text(text))
+
+    print(f"{len(texts)} requests from {args.concurrency} concurrent clients")
+    print(f"{'Setting':<28}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}")
+
+    rate, latencies = run_load(predict_single, texts, args.concurrency)
+    print(f"{'unbatched':<28}{rate:>10,.0f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}{1:>12.1f}")
+
+    for wait_ms in args.wait_ms:
+        batcher = MicroBatcher(predict_reviews, max_batch_size=args.max_batch_size, max_wait_ms=wait_ms)
+        rate, latencies = run_load(batcher.submit, texts, args.concurrency)
+        mean_batch = batcher.stats()['batch_size']['mean']
+        label = f"batched, wait {wait_ms:g} ms"
+        print(f"{label:<28}{rate:>10,.0f}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}{mean_batch:>12.1f}")
+
+if __name__ == "__main__":
+    main()
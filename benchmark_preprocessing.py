@@ -0,0 +1,71 @@
+import argparse
+import sys
+import time
+import pandas as pd
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor
+
+def compare_tokens(texts):
+    """
+    Compare word_tokenize and fast tokenization on every text of a corpus.
+
+    Parameters:
+    texts (list): Raw review texts
+
+    Returns:
+    list: Indices of texts whose token lists differ
+    """
+    standard = TextPreprocessor(fast_tokenize=False)
+    fast = TextPreprocessor(fast_tokenize=True)
+
+    mismatches = []
+    for i, text in enumerate(texts):
+        cleaned_text = standard.clean_text(text)
+        if standard.tokenize_and_remove_stopwords(cleaned_text) != fast.tokenize_and_remove_stopwords(cleaned_text):
+            mismatches.append(i)
+    return mismatches
+
+def time_preprocess_dataframe(df, text_column, **preprocessor_options):
+    """
+    Measure preprocess_dataframe throughput.
+
+    Returns:
+    tuple: (rows per second, processed dataframe)
+    """
+    preprocessor = TextPreprocessor(**preprocessor_options)
+    start_time = time.perf_counter()
+    df_processed = preprocessor.preprocess_dataframe(df, text_column)
+    elapsed = time.perf_counter() - start_time
+    return len(df) / elapsed, df_processed
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Benchmark preprocess_dataframe and check fast tokenization parity')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV data file (Rating,Title,Text)')
+    parser.add_argument('--num_samples', type=int, default=50000, help='Number of reviews to read')
+
+    args = parser.parse_args()
+
+    print(f"Loading {args.num_samples} reviews from {args.data_path}...")
+    df = pd.read_csv(args.data_path, header=None, names=['Rating', 'Title', 'Text'], nrows=args.num_samples)
+    df['Text'] = df['Text'].fillna('').astype(str)
+
+    # Corpus-level parity check of the token output
+    mismatches = compare_tokens(df['Text'].tolist())
+    print(f"Token parity: {len(df) - len(mismatches)}/{len(df)} reviews identical")
+    for i in mismatches[:10]:
+        print(f"  Mismatch at row {i}: {df['Text'].iloc[i][:80]!r}")
+
+    # Throughput before and after
+    standard_rate, standard_df = time_preprocess_dataframe(df, 'Text', fast_tokenize=False)
+    fast_rate, fast_df = time_preprocess_dataframe(df, 'Text', fast_tokenize=True)
+    print(f"word_tokenize:     {standard_rate:,.0f} rows/s")
+    print(f"fast tokenization: {fast_rate:,.0f} rows/s ({fast_rate / standard_rate:.2f}x)")
+
+    if mismatches or not standard_df['Text_processed'].equals(fast_df['Text_processed']):
+        print("Parity check FAILED")
+        sys.exit(1)
+    print("Parity check passed")
+
+if __name__ == "__main__":
+    main()
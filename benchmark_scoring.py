@@ -0,0 +1,104 @@
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor
+from model import SentimentModel
+
+SAMPLE_REVIEWS = [
+    "This product is amazing! I would definitely buy it again.",
+    "Terrible product. Waste of money, it broke after a week.",
+    "It's okay, not great but not terrible either.",
+    "I would definitely recommend this to others.",
+    "Poor quality, the seller never answered my emails.",
+    "Works as described and arrived earlier than expected.",
+    "",
+]
+
+def check_parity(model, texts):
+    """
+    Compare the compiled scorer against the sklearn vectorizer + model path.
+
+    Parameters:
+    model (SentimentModel): Loaded model with a compiled scorer
+    texts (list): Preprocessed texts to score
+
+    Returns:
+    tuple: (number of label mismatches, maximum absolute probability difference)
+    """
+    X = model.vectorizer.transform(texts)
+    sklearn_labels = model.model.predict(X)
+    sklearn_probabilities = model.model.predict_proba(X)
+
+    mismatches = 0
+    max_difference = 0.0
+    class_index = {label: i for i, label in enumerate(model.model.classes_)}
+    for i, text in enumerate(texts):
+        label, probability = model.scorer.score(text)
+        if label != sklearn_labels[i]:
+            mismatches += 1
+        expected = sklearn_probabilities[i, class_index[label]]
+        max_difference = max(max_difference, abs(probability - expected))
+
+    return mismatches, max_difference
+
+def time_per_review(predict, texts, repeat):
+    """
+    Measure the mean latency of a single-text predict function.
+
+    Returns:
+    float: Mean latency in microseconds
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            predict(text)
+    return (time.perf_counter() - start_time) / (repeat * len(texts)) * 1e6
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Check parity and latency of the compiled scorer against sklearn')
+    parser.add_argument('--model_path', type=str, default='models/best_sentiment_model.pkl', help='Path to the trained model')
+    parser.add_argument('--data_path', type=str, default=None, help='Optional CSV file (Rating,Title,Text) to draw reviews from')
+    parser.add_argument('--num_samples', type=int, default=2000, help='Number of reviews to read from the data file')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timing repetitions')
+
+    args = parser.parse_args()
+
+    model = SentimentModel(model_type='logistic_regression')
+    model.load_model(args.model_path)
+    if model.scorer is None:
+        print("The loaded model cannot be compiled into a linear scorer. Exiting.")
+        sys.exit(1)
+
+    if args.data_path:
+        df = pd.read_csv(args.data_path, header=None, names=['Rating', 'Title', 'Text'], nrows=args.num_samples)
+        raw_texts = df['Text'].fillna('').astype(str).tolist()
+    else:
+        raw_texts = SAMPLE_REVIEWS
+
+    preprocessor = TextPreprocessor()
+    texts = [preprocessor.preprocess_text(text) for text in raw_texts]
+
+    mismatches, max_difference = check_parity(model, texts)
+    print(f"Reviews checked: {len(texts)}")
+    print(f"Label mismatches: {mismatches}")
+    print(f"Max probability difference: {max_difference:.3e}")
+
+    def sklearn_predict(text):
+        return model.model.predict(model.vectorizer.transform([text]))[0]
+
+    sklearn_latency = time_per_review(sklearn_predict, texts, args.repeat)
+    compiled_latency = time_per_review(model.scorer.score, texts, args.repeat)
+    print(f"sklearn path: {sklearn_latency:.1f} us/review")
+    print(f"Compiled scorer: {compiled_latency:.1f} us/review ({sklearn_latency / compiled_latency:.1f}x faster)")
+
+    if mismatches or not np.isclose(max_difference, 0.0, atol=1e-9):
+        print("Parity check FAILED")
+        sys.exit(1)
+    print("Parity check passed")
+
+if __name__ == "__main__":
+    main()
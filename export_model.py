@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor
+from model import SentimentModel
+
+def artifact_size(path):
+    """
+    Get the size of a model artifact (a file or an artifact directory) in bytes.
+    """
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+def timed_load(path, repeat=3):
+    """
+    Load a model several times and keep the fastest load.
+
+    Returns:
+    tuple: (loaded SentimentModel, best load time in seconds)
+    """
+    best_time = None
+    for _ in range(repeat):
+        model = SentimentModel()
+        start_time = time.perf_counter()
+        model.load_model(path)
+        elapsed = time.perf_counter() - start_time
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    return model, best_time
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Convert a trained sentiment model to another artifact format')
+    parser.add_argument('--model_path', type=str, default='models/best_sentiment_model.pkl', help='Path to the trained model')
+    parser.add_argument('--output_path', type=str, default='models/best_sentiment_model', help='Path of the exported artifact')
+    parser.add_argument('--format', type=str, default='mmap', choices=['pickle', 'mmap'],
+                        help="Artifact format ('mmap' writes a directory that web workers can memory-map)")
+    parser.add_argument('--slim', action='store_true', help='Drop training-only state from a pickle artifact')
+    parser.add_argument('--holdout_path', type=str, default=None,
+                        help='CSV file (Rating,Title,Text) used to verify the exported model predicts identically')
+    parser.add_argument('--num_samples', type=int, default=10000, help='Number of holdout reviews to verify')
+
+    args = parser.parse_args()
+
+    model = SentimentModel()
+    model.load_model(args.model_path)
+    model.save_model(args.output_path, artifact_format=args.format, slim=args.slim)
+
+    # Report size and cold load time before and after
+    original_model, original_load_time = timed_load(args.model_path)
+    exported_model, exported_load_time = timed_load(args.output_path)
+    original_size = artifact_size(args.model_path)
+    exported_size = artifact_size(args.output_path)
+    print(f"Artifact size: {original_size / 1024:.1f} KB -> {exported_size / 1024:.1f} KB")
+    print(f"Load time: {original_load_time * 1000:.1f} ms -> {exported_load_time * 1000:.1f} ms")
+
+    if args.holdout_path is None:
+        return
+
+    # Verify identical predictions on a holdout sample
+    df = pd.read_csv(args.holdout_path, header=None, names=['Rating', 'Title', 'Text'], nrows=args.num_samples)
+    preprocessor = TextPreprocessor()
+    texts = [preprocessor.preprocess_text(text) for text in df['Text'].fillna('').astype(str)]
+
+    original_predictions, original_scores = original_model.predict_batch(texts, return_scores=True)
+    exported_predictions, exported_scores = exported_model.predict_batch(texts, return_scores=True)
+    if not np.array_equal(original_predictions, exported_predictions) or not np.allclose(original_scores, exported_scores):
+        print(f"Prediction check FAILED on {len(texts)} holdout reviews")
+        sys.exit(1)
+    print(f"Predictions identical on {len(texts)} holdout reviews")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import os
+import sys
+import time
+sys.path.append('src')
+from data_preprocessing import convert_csv_to_parquet
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Convert an Amazon review CSV file to Parquet once, for faster training runs')
+    parser.add_argument('--csv_path', type=str, required=True, help='Path to the CSV data file (Rating,Title,Text)')
+    parser.add_argument('--output_path', type=str, default=None,
+                        help='Path of the Parquet file (defaults to the CSV path with a .parquet extension)')
+    parser.add_argument('--row_group_size', type=int, default=100000, help='Number of rows per Parquet row group')
+
+    args = parser.parse_args()
+
+    output_path = args.output_path or os.path.splitext(args.csv_path)[0] + '.parquet'
+
+    print(f"Converting {args.csv_path} to {output_path}...")
+    start_time = time.time()
+    n_rows = convert_csv_to_parquet(args.csv_path, output_path, row_group_size=args.row_group_size)
+    elapsed = time.time() - start_time
+
+    csv_size = os.path.getsize(args.csv_path)
+    parquet_size = os.path.getsize(output_path)
+    print(f"Converted {n_rows} rows in {elapsed:.2f} seconds")
+    print(f"Size: {csv_size / 1024 / 1024:.1f} MB CSV -> {parquet_size / 1024 / 1024:.1f} MB Parquet")
+    print(f"Pass {output_path} as --data_path to the training scripts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import shutil
+import sys
+import pandas as pd
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor, SAMPLING_METHODS, load_sample, create_sentiment_labels, iter_labeled_chunks
+from model import SentimentModel, vocabulary_sweep, write_vocabulary_report
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Prune the vocabulary to the most discriminative terms and report accuracy against cost')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV or Parquet training data file')
+    parser.add_argument('--test_path', type=str, default=None,
+                        help='Test partition written by split_data.py (20%% of --data_path is held out if not given)')
+    parser.add_argument('--text_column', type=str, default='Text', help='Name of the text column')
+    parser.add_argument('--rating_column', type=str, default='Rating', help='Name of the rating column')
+    parser.add_argument('--model_type', type=str, default='logistic_regression',
+                        choices=['logistic_regression', 'naive_bayes'],
+                        help='Type of model to train')
+    parser.add_argument('--method', type=str, default='chi2', choices=['chi2', 'coef'],
+                        help='Rank terms by chi-squared statistic or by logistic regression coefficient magnitude')
+    parser.add_argument('--sizes', type=str, default='1000,2000,5000,10000,20000', help='Comma-separated vocabulary sizes')
+    parser.add_argument('--max_features', type=int, default=20000, help='Vocabulary size of the vectorizer before selection')
+    parser.add_argument('--max_samples', type=int, default=200000, help='Maximum number of training samples to use')
+    parser.add_argument('--sampling', type=str, default='reservoir', choices=SAMPLING_METHODS,
+                        help='How max_samples rows are chosen: the first rows, a uniform random sample, or by content hash')
+    parser.add_argument('--random_state', type=int, default=42, help='Seed for sampling')
+    parser.add_argument('--min_accuracy', type=float, default=None, help='Accuracy bar the shipped model has to meet')
+    parser.add_argument('--output_dir', type=str, default='models', help='Directory for the report and the swept models')
+    parser.add_argument('--output_path', type=str, default=None,
+                        help='Copy the smallest model meeting --min_accuracy to this path (e.g. models/best_sentiment_model.pkl)')
+    parser.add_argument('--fast_tokenize', action='store_true', help='Tokenize cleaned text with a whitespace split instead of word_tokenize')
+    parser.add_argument('--n_jobs', type=int, default=1, help='Number of preprocessing worker processes (-1 uses all CPU cores)')
+
+    args = parser.parse_args()
+
+    if args.output_path and args.min_accuracy is None:
+        parser.error('--output_path requires --min_accuracy')
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    processed_column = f'{args.text_column}_processed'
+    preprocessor = TextPreprocessor(fast_tokenize=args.fast_tokenize)
+
+    # Load, label and preprocess the training data
+    print(f"Loading data from {args.data_path}...")
+    df = load_sample(args.data_path, sample_size=args.max_samples, columns=[args.rating_column, args.text_column],
+                     method=args.sampling, random_state=args.random_state)
+    print(f"Loaded {len(df)} records")
+    df = create_sentiment_labels(df, args.rating_column, args.text_column, inplace=True)
+    df[processed_column] = preprocessor.preprocess_series(df[args.text_column], n_jobs=args.n_jobs)
+
+    if args.test_path:
+        print(f"Loading test data from {args.test_path}...")
+        test_df = pd.concat(
+            iter_labeled_chunks(args.test_path, preprocessor, args.rating_column, args.text_column, n_jobs=args.n_jobs),
+            ignore_index=True
+        )
+        X_train, y_train = df[processed_column], df['sentiment_binary']
+        X_test, y_test = test_df[processed_column], test_df['sentiment_binary']
+    else:
+        X_train, X_test, y_train, y_test = SentimentModel().prepare_data(df, processed_column, 'sentiment_binary')
+
+    # Train and measure one model per vocabulary size
+    artifact_dir = os.path.join(args.output_dir, 'vocabulary_sweep')
+    os.makedirs(artifact_dir, exist_ok=True)
+    results = vocabulary_sweep(X_train, y_train, X_test, y_test, sizes, method=args.method,
+                               model_type=args.model_type, max_features=args.max_features,
+                               artifact_dir=artifact_dir)
+
+    report_path = os.path.join(args.output_dir, 'vocabulary_sweep.txt')
+    write_vocabulary_report(results, report_path, min_accuracy=args.min_accuracy)
+    with open(report_path, 'r') as f:
+        print(f.read())
+    print(f"Vocabulary sweep results saved to {report_path}")
+
+    if args.min_accuracy is not None:
+        passing = [size for size, metrics in results.items() if metrics['accuracy'] >= args.min_accuracy]
+        if not passing:
+            print(f"No vocabulary size reaches an accuracy of {args.min_accuracy:.4f}")
+            sys.exit(1)
+
+        smallest = min(passing)
+        print(f"Smallest vocabulary meeting the bar: {smallest} terms "
+              f"(accuracy {results[smallest]['accuracy']:.4f})")
+        if args.output_path:
+            directory = os.path.dirname(args.output_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            shutil.copyfile(results[smallest]['artifact_path'], args.output_path)
+            print(f"Model copied to {args.output_path}")
+
+if __name__ == "__main__":
+    main()
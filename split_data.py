@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+import time
+sys.path.append('src')
+from data_preprocessing import split_data
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Split Amazon review data into train and test partitions once, by a hash of each review')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV or Parquet data file')
+    parser.add_argument('--output_dir', type=str, default='data/split', help='Directory for train.parquet, test.parquet and split.json')
+    parser.add_argument('--test_size', type=float, default=0.2, help='Fraction of reviews assigned to the test partition')
+    parser.add_argument('--random_state', type=int, default=42, help='Salt of the partition hash')
+    parser.add_argument('--batch_size', type=int, default=100000, help='Number of rows read at a time')
+    parser.add_argument('--text_column', type=str, default='Text', help='Name of the text column')
+    parser.add_argument('--rating_column', type=str, default='Rating', help='Name of the rating column')
+
+    args = parser.parse_args()
+
+    print(f"Splitting {args.data_path} into {args.output_dir}...")
+    start_time = time.time()
+    manifest = split_data(args.data_path, args.output_dir, test_size=args.test_size, random_state=args.random_state,
+                          chunksize=args.batch_size, rating_column=args.rating_column, text_column=args.text_column)
+    elapsed = time.time() - start_time
+
+    print(f"Split {sum(manifest['rows'].values())} rows in {elapsed:.2f} seconds")
+    for name, n_rows in manifest['rows'].items():
+        print(f"  {name}: {n_rows} rows -> {os.path.join(args.output_dir, manifest['files'][name])}")
+
+    # Class balance: the share of each rating that went to the test partition
+    for rating in sorted(set(manifest['ratings']['train']) | set(manifest['ratings']['test'])):
+        n_train = manifest['ratings']['train'].get(rating, 0)
+        n_test = manifest['ratings']['test'].get(rating, 0)
+        print(f"  Rating {rating}: {n_test / (n_train + n_test):.2%} in test")
+
+    train_path = os.path.join(args.output_dir, manifest['files']['train'])
+    test_path = os.path.join(args.output_dir, manifest['files']['test'])
+    print(f"Train with --data_path {train_path} --test_path {test_path}")
+
+if __name__ == "__main__":
+    main()
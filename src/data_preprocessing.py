@@ -1,39 +1,277 @@
-import pandas as pd
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-
-# Download NLTK resources if needed
-try:
-    stopwords.words('english')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+import os
+import json
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+
+# pandas and NLTK are imported where they are first needed so that importing this
+# module stays cheap and never touches the network (see benchmark_imports.py).
+
+# NLTK resources used by TextPreprocessor: (resource path, download name)
+NLTK_RESOURCES = [
+    ('corpora/stopwords', 'stopwords'),
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/wordnet', 'wordnet'),
+    ('tokenizers/punkt_tab', 'punkt_tab'),
+]
+
+def ensure_nltk_resources(download=True):
+    """
+    Make sure the NLTK resources used by TextPreprocessor are installed.
+
+    Parameters:
+    download (bool): Download missing resources (requires network access)
+
+    Returns:
+    list: Names of resources that are still missing
+    """
+    import nltk
+
+    missing = []
+    for resource_path, name in NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            if not (download and nltk.download(name)):
+                missing.append(name)
+    return missing
+
+# Bump when preprocess_text changes its output so cached corpora are recomputed
+PREPROCESSING_VERSION = 1
+
+# Splits NLTK's Treebank word tokenizer applies to purely alphabetic words.
+# The fast tokenization mode reproduces them so both modes yield the same tokens.
+TREEBANK_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+class LemmaCache:
+    """
+    A bounded LRU cache mapping tokens to their lemmas, with hit/miss counters.
+    """
+
+    def __init__(self, lemmatize, max_size=100000):
+        """
+        Initialize the cache.
+
+        Parameters:
+        lemmatize (callable): Function computing the lemma of a token on a cache miss
+        max_size (int): Maximum number of tokens kept before evicting the least recently used
+        """
+        self._lemmatize = lemmatize
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._new_entries = None
+        self._lock = threading.Lock()
+
+    def lemmatize(self, token):
+        """
+        Return the lemma of a token, computing and caching it on a miss.
+
+        Parameters:
+        token (str): Token to lemmatize
+
+        Returns:
+        str: Lemmatized token
+        """
+        with self._lock:
+            lemma = self._entries.get(token)
+            if lemma is not None:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return lemma
+            self.misses += 1
+
+        lemma = self._lemmatize(token)
+
+        with self._lock:
+            self._entries[token] = lemma
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            if self._new_entries is not None:
+                self._new_entries.append((token, lemma))
+
+        return lemma
+
+    def take_new_entries(self):
+        """
+        Get the lemmas computed since the previous call, and keep recording new ones.
+
+        Preprocessing workers send these back so the parent's cache, which is the
+        one saved to disk, also learns the lemmas computed in other processes.
+
+        Returns:
+        list: (token, lemma) pairs
+        """
+        with self._lock:
+            entries = self._new_entries or []
+            self._new_entries = []
+        return entries
+
+    def merge(self, entries, hits=0, misses=0):
+        """
+        Add lemmas and lookup counts collected by another process's cache.
+
+        Parameters:
+        entries (list): (token, lemma) pairs, least recently used first
+        hits (int): Number of cache hits to add
+        misses (int): Number of cache misses to add
+        """
+        with self._lock:
+            for token, lemma in entries:
+                self._entries[token] = lemma
+                self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+        dict: Size, maximum size, hits, misses and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def save(self, path):
+        """
+        Save the cached lemmas to a JSON file, least recently used first.
+
+        Parameters:
+        path (str): Path to the cache file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            entries = list(self._entries.items())
+
+        # Write to a temporary file first so readers never see a partial cache
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Warm the cache from a JSON file written by save().
+
+        Parameters:
+        path (str): Path to the cache file
+
+        Returns:
+        int: Number of entries loaded
+        """
+        with open(path, 'r') as f:
+            entries = json.load(f)
+
+        # Keep only the most recently used entries that fit in the cache
+        entries = entries[-self.max_size:]
+        with self._lock:
+            for token, lemma in entries:
+                self._entries[token] = lemma
+                self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return len(entries)
 
 class TextPreprocessor:
     """
     A class for preprocessing text data for sentiment analysis.
     """
 
-    def __init__(self):
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, lemma_cache_size=100000, lemma_cache_path=None, fast_tokenize=False, lazy=False):
+        """
+        Initialize the preprocessor.
+
+        Parameters:
+        lemma_cache_size (int): Maximum number of cached token lemmas (0 disables the cache)
+        lemma_cache_path (str): Optional JSON file used to warm the lemma cache if it exists
+        fast_tokenize (bool): Tokenize cleaned text with a whitespace split instead of word_tokenize
+        lazy (bool): Defer importing NLTK and checking its resources until the first text is
+            preprocessed, so that creating the preprocessor is instant
+        """
+        self.fast_tokenize = fast_tokenize
+        self.lemma_cache_size = lemma_cache_size
+        self.lemma_cache_path = lemma_cache_path
+
+        self._lemmatizer = None
+        self._stop_words = None
+        self._word_tokenize = None
+        self._resources_lock = threading.Lock()
+
+        self.lemma_cache = None
+        if lemma_cache_size:
+            self.lemma_cache = LemmaCache(self._lemmatize_uncached, max_size=lemma_cache_size)
+            if lemma_cache_path and os.path.exists(lemma_cache_path):
+                self.lemma_cache.load(lemma_cache_path)
+
+        if not lazy:
+            self.load_resources()
+
+    def load_resources(self):
+        """
+        Import NLTK, download missing resources and load the stop words and lemmatizer.
+
+        Called by the constructor, or on first use when the preprocessor is lazy.
+        """
+        with self._resources_lock:
+            if self._stop_words is not None:
+                return
+
+            ensure_nltk_resources()
+
+            from nltk.corpus import stopwords
+            from nltk.stem import WordNetLemmatizer
+            from nltk.tokenize import word_tokenize
+
+            self._lemmatizer = WordNetLemmatizer()
+            self._word_tokenize = word_tokenize
+            self._stop_words = set(stopwords.words('english'))
+
+    @property
+    def stop_words(self):
+        """
+        Set of English stop words removed during tokenization.
+        """
+        if self._stop_words is None:
+            self.load_resources()
+        return self._stop_words
+
+    @property
+    def lemmatizer(self):
+        """
+        WordNet lemmatizer used to lemmatize tokens.
+        """
+        if self._stop_words is None:
+            self.load_resources()
+        return self._lemmatizer
+
+    def _lemmatize_uncached(self, token):
+        """
+        Lemmatize a token with WordNet, bypassing the lemma cache.
+        """
+        return self.lemmatizer.lemmatize(token)
 
     def clean_text(self, text):
         """
@@ -63,8 +301,36 @@ class TextPreprocessor:
         Returns:
         list: List of tokens without stopwords
         """
-        tokens = word_tokenize(text)
-        tokens = [token for token in tokens if token not in self.stop_words]
+        if self.fast_tokenize:
+            return self._split_and_remove_stopwords(text)
+
+        stop_words = self.stop_words
+        tokens = self._word_tokenize(text)
+        tokens = [token for token in tokens if token not in stop_words]
+        return tokens
+
+    def _split_and_remove_stopwords(self, text):
+        """
+        Tokenize text produced by clean_text with a whitespace split.
+
+        clean_text leaves only lowercase letters and spaces, so word_tokenize reduces to a
+        whitespace split plus the few word splits listed in TREEBANK_SPLITS.
+
+        Parameters:
+        text (str): Cleaned text to tokenize
+
+        Returns:
+        list: List of tokens without stopwords
+        """
+        stop_words = self.stop_words
+        tokens = []
+        for token in text.split():
+            split = TREEBANK_SPLITS.get(token)
+            if split is None:
+                if token not in stop_words:
+                    tokens.append(token)
+            else:
+                tokens.extend(part for part in split if part not in stop_words)
         return tokens
 
     def lemmatize_tokens(self, tokens):
@@ -77,7 +343,8 @@ class TextPreprocessor:
         Returns:
         list: List of lemmatized tokens
         """
-        lemmatized_tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+        lemmatize = self.lemma_cache.lemmatize if self.lemma_cache is not None else self.lemmatizer.lemmatize
+        lemmatized_tokens = [lemmatize(token) for token in tokens]
         return lemmatized_tokens
 
     def preprocess_text(self, text):
@@ -104,69 +371,686 @@ class TextPreprocessor:
 
         return preprocessed_text
 
-    def preprocess_dataframe(self, df, text_column):
+    def get_config(self):
+        """
+        Get the constructor options needed to recreate this preprocessor.
+
+        Returns:
+        dict: Preprocessor configuration
+        """
+        return {
+            'lemma_cache_size': self.lemma_cache_size,
+            'lemma_cache_path': self.lemma_cache_path,
+            'fast_tokenize': self.fast_tokenize
+        }
+
+    def open_pool(self, n_jobs):
+        """
+        Start a pool of preprocessing worker processes that can be reused across calls.
+
+        Each worker loads the NLTK resources once in its initializer, so streaming code
+        that preprocesses many chunks should open one pool and pass it to every call.
+        The caller terminates the pool when done.
+
+        Parameters:
+        n_jobs (int): Number of worker processes (-1 uses all CPU cores)
+
+        Returns:
+        multiprocessing.pool.Pool: The pool, or None if n_jobs resolves to a single process
+        """
+        if n_jobs is None or n_jobs == 0:
+            n_jobs = 1
+        elif n_jobs < 0:
+            n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+
+        if n_jobs == 1:
+            return None
+        return multiprocessing.Pool(n_jobs, initializer=_init_preprocessing_worker, initargs=(self.get_config(),))
+
+    def iter_preprocess(self, texts, n_jobs=1, chunk_size=10000, pool=None):
+        """
+        Preprocess texts in chunks, optionally across a pool of worker processes.
+
+        Chunks are yielded in input order as soon as they are ready, so callers can
+        stream results without waiting for the whole corpus.
+
+        Parameters:
+        texts (iterable): Input texts to preprocess
+        n_jobs (int): Number of worker processes (-1 uses all CPU cores, 1 runs in this process)
+        chunk_size (int): Number of texts sent to a worker at a time
+        pool (multiprocessing.pool.Pool): Pool from open_pool() to use instead of starting one
+
+        Yields:
+        list: Preprocessed texts of one chunk
+        """
+        chunks = _iter_chunks(texts, chunk_size)
+
+        if pool is None:
+            pool = self.open_pool(n_jobs)
+            if pool is None:
+                for chunk in chunks:
+                    yield [self.preprocess_text(text) for text in chunk]
+                return
+            with pool:
+                yield from self._imap_preprocess(pool, chunks)
+        else:
+            yield from self._imap_preprocess(pool, chunks)
+
+    def _imap_preprocess(self, pool, chunks):
+        """
+        Preprocess chunks in a worker pool, merging the workers' new lemmas into this lemma cache.
+        """
+        for processed_chunk, cache_delta in pool.imap(_preprocess_chunk, chunks):
+            if cache_delta is not None and self.lemma_cache is not None:
+                self.lemma_cache.merge(*cache_delta)
+            yield processed_chunk
+
+    def preprocess_series(self, texts, n_jobs=1, chunk_size=10000, report_every=None, pool=None):
+        """
+        Preprocess a column of texts into a new Series with the same index.
+
+        Each chunk becomes an Arrow-backed string Series as soon as it is ready, so the
+        processed texts are held as separate Python strings only one chunk at a time
+        and the finished column is far smaller than a list of strings. pandas 3 infers
+        that dtype by itself; older versions are given 'string[pyarrow]' explicitly.
+
+        Parameters:
+        texts (pandas.Series): Input texts to preprocess
+        n_jobs (int): Number of worker processes (-1 uses all CPU cores)
+        chunk_size (int): Number of texts preprocessed at a time
+        report_every (int): Print progress every this many texts (never if None)
+        pool (multiprocessing.pool.Pool): Pool from open_pool() to use instead of starting one
+
+        Returns:
+        pandas.Series: Preprocessed texts
+        """
+        import pandas as pd
+
+        # Keep the inferred str dtype where it is not object (pandas 3), so NaN semantics are unchanged
+        dtype = 'string[pyarrow]' if pd.Series(['']).dtype == object else None
+
+        processed_chunks = []
+        n_processed = 0
+        next_report = report_every
+        for processed_chunk in self.iter_preprocess(texts, n_jobs=n_jobs, chunk_size=chunk_size, pool=pool):
+            processed_chunks.append(pd.Series(processed_chunk, dtype=dtype))
+            n_processed += len(processed_chunk)
+            if report_every and (n_processed >= next_report or n_processed == len(texts)):
+                print(f"Processed {n_processed} of {len(texts)} records")
+                next_report += report_every
+
+        if not processed_chunks:
+            return pd.Series([], index=texts.index, dtype=dtype or str)
+        return pd.concat(processed_chunks, ignore_index=True).set_axis(texts.index)
+
+    def preprocess_dataframe(self, df, text_column, n_jobs=1, chunk_size=10000, inplace=False, pool=None):
         """
         Apply preprocessing to a dataframe column.
 
+        Only the processed column is added; unless inplace is True it goes on a
+        shallow copy, so the input columns are shared rather than copied.
+
         Parameters:
         df (pandas.DataFrame): Input dataframe
         text_column (str): Name of the column containing text to preprocess
+        n_jobs (int): Number of worker processes (-1 uses all CPU cores)
+        chunk_size (int): Number of texts preprocessed at a time
+        inplace (bool): Add the processed column to df itself
+        pool (multiprocessing.pool.Pool): Pool from open_pool() to use instead of starting one
+
+        Returns:
+        pandas.DataFrame: Dataframe with preprocessed text (df itself if inplace)
+        """
+        if not inplace:
+            df = df.copy(deep=False)
+        df[f'{text_column}_processed'] = self.preprocess_series(df[text_column], n_jobs=n_jobs, chunk_size=chunk_size,
+                                                                pool=pool)
+        return df
+
+    def save_lemma_cache(self, path):
+        """
+        Persist the lemma cache so later runs can warm from it.
+
+        Parameters:
+        path (str): Path to the cache file
+        """
+        if self.lemma_cache is not None:
+            self.lemma_cache.save(path)
+
+class PreprocessedCorpusCache:
+    """
+    An on-disk cache of preprocessed corpora stored as Parquet files.
+
+    Each entry is keyed by a hash of the input file contents, the preprocessor
+    configuration and any extra parameters that select the rows (e.g. sample size),
+    so a changed input or configuration never reuses a stale entry.
+    """
+
+    def __init__(self, cache_dir='data/cache'):
+        """
+        Initialize the cache.
+
+        Parameters:
+        cache_dir (str): Directory holding the cached corpora
+        """
+        self.cache_dir = cache_dir
+        self._fingerprints_path = os.path.join(cache_dir, 'fingerprints.json')
+
+    def file_fingerprint(self, file_path):
+        """
+        Compute the SHA-256 of a file's contents.
+
+        Digests are remembered by path, size and modification time so an unchanged
+        file is not rehashed on every run.
+
+        Parameters:
+        file_path (str): Path to the file
 
         Returns:
-        pandas.DataFrame: Dataframe with preprocessed text
+        str: Hex digest of the file contents
         """
-        df_copy = df.copy()
-        df_copy[f'{text_column}_processed'] = df_copy[text_column].apply(self.preprocess_text)
-        return df_copy
+        stat = os.stat(file_path)
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        abs_path = os.path.abspath(file_path)
+
+        fingerprints = {}
+        if os.path.exists(self._fingerprints_path):
+            with open(self._fingerprints_path, 'r') as f:
+                fingerprints = json.load(f)
+        entry = fingerprints.get(abs_path)
+        if entry is not None and entry['stamp'] == stamp:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+        fingerprints[abs_path] = {'stamp': stamp, 'sha256': digest.hexdigest()}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._fingerprints_path, 'w') as f:
+            json.dump(fingerprints, f)
+
+        return digest.hexdigest()
+
+    def path_for(self, data_path, preprocessor, **params):
+        """
+        Get the cache file path for a corpus.
+
+        Parameters:
+        data_path (str): Path to the raw input file
+        preprocessor (TextPreprocessor): Preprocessor producing the cached text
+        **params: Extra parameters that affect which rows or columns are cached
 
-def load_data(file_path):
+        Returns:
+        str: Path of the cache file (which may not exist yet)
+        """
+        key = {
+            'data': self.file_fingerprint(data_path),
+            'preprocessing_version': PREPROCESSING_VERSION,
+            'fast_tokenize': preprocessor.fast_tokenize,
+            'stop_words': sorted(preprocessor.stop_words),
+            'params': params
+        }
+        key_hash = hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'preprocessed_{key_hash[:16]}.parquet')
+
+    def load(self, cache_path):
+        """
+        Load a cached corpus.
+
+        Parameters:
+        cache_path (str): Path returned by path_for()
+
+        Returns:
+        pandas.DataFrame: Cached dataframe, or None if the entry does not exist
+        """
+        if not os.path.exists(cache_path):
+            return None
+        import pandas as pd
+
+        return pd.read_parquet(cache_path)
+
+    def save(self, df, cache_path, columns):
+        """
+        Save a preprocessed corpus to the cache.
+
+        Parameters:
+        df (pandas.DataFrame): Preprocessed dataframe
+        cache_path (str): Path returned by path_for()
+        columns (list): Columns to store, e.g. the processed text and labels
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so an interrupted run never leaves a partial entry
+        tmp_path = f"{cache_path}.tmp"
+        df[columns].reset_index(drop=True).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+
+def _iter_chunks(items, chunk_size):
+    """
+    Split an iterable into lists of at most chunk_size items.
     """
-    Load data from a CSV file.
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# Preprocessor of the current worker process, created once by _init_preprocessing_worker
+_worker_preprocessor = None
+
+def _init_preprocessing_worker(config):
+    """
+    Create the worker's preprocessor so NLTK resources are loaded once per process.
+    """
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(**config)
+    if _worker_preprocessor.lemma_cache is not None:
+        _worker_preprocessor.lemma_cache.take_new_entries()
+
+def _preprocess_chunk(texts):
+    """
+    Preprocess a chunk of texts in a worker process.
+
+    Returns:
+    tuple: (preprocessed texts, (new lemmas, hits, misses) of the worker's lemma cache
+        for this chunk, or None without a cache)
+    """
+    cache = _worker_preprocessor.lemma_cache
+    if cache is None:
+        return [_worker_preprocessor.preprocess_text(text) for text in texts], None
+
+    hits, misses = cache.hits, cache.misses
+    processed = [_worker_preprocessor.preprocess_text(text) for text in texts]
+    return processed, (cache.take_new_entries(), cache.hits - hits, cache.misses - misses)
+
+# Columns of the Amazon review CSV files, which have no header row
+REVIEW_COLUMNS = ['Rating', 'Title', 'Text']
+
+# Titles and texts are read as strings even when a chunk only holds numbers
+REVIEW_DTYPES = {'Title': str, 'Text': str}
+
+def is_parquet(file_path):
+    """
+    Check whether a data path refers to a Parquet file written by convert_csv_to_parquet.
+    """
+    return isinstance(file_path, str) and file_path.endswith('.parquet')
+
+def load_data(file_path, columns=None):
+    """
+    Load data from a CSV or Parquet file.
 
     Parameters:
-    file_path (str): Path to the CSV file
+    file_path (str): Path to the CSV file, or to a Parquet file written by convert_csv_to_parquet
+    columns (list): Columns to load (all columns if None)
 
     Returns:
     pandas.DataFrame: Loaded dataframe
     """
+    import pandas as pd
+
     try:
+        if is_parquet(file_path):
+            return pd.read_parquet(file_path, columns=columns)
+
         # Load data without header and assign column names
-        df = pd.read_csv(file_path, header=None)
-        df.columns = ['Rating', 'Title', 'Text']
-        return df
+        return pd.read_csv(file_path, header=None, names=REVIEW_COLUMNS, usecols=columns, dtype=REVIEW_DTYPES)
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
-def create_sentiment_labels(df, rating_column, text_column):
+def iter_data_chunks(file_path, chunksize=100000, columns=None, start_row=0, max_rows=None):
+    """
+    Stream a CSV or Parquet file in chunks without loading it all into memory.
+
+    Parameters:
+    file_path (str or file-like): Path to the CSV or Parquet file, or an open CSV stream
+    chunksize (int): Number of rows per chunk
+    columns (list): Columns to read (all columns if None); with Parquet, other columns are never read
+    start_row (int): Number of rows to skip at the start of the file
+    max_rows (int): Maximum number of rows to yield (all remaining rows if None)
+
+    Yields:
+    pandas.DataFrame: Chunk with the requested columns of Rating, Title and Text
+    """
+    if is_parquet(file_path):
+        chunks = _iter_parquet_chunks(file_path, chunksize, columns, start_row)
+    else:
+        import pandas as pd
+
+        chunks = pd.read_csv(file_path, header=None, names=REVIEW_COLUMNS, usecols=columns, dtype=REVIEW_DTYPES,
+                             skiprows=start_row or None, chunksize=chunksize)
+
+    n_rows = 0
+    for chunk in chunks:
+        if max_rows is not None and n_rows + len(chunk) >= max_rows:
+            yield chunk.iloc[:max_rows - n_rows]
+            return
+        n_rows += len(chunk)
+        yield chunk
+
+def _iter_parquet_chunks(file_path, chunksize, columns, start_row):
+    """
+    Stream a Parquet file in chunks, skipping whole row groups before start_row.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+
+    # Row groups that end before start_row are never read
+    row_groups = []
+    skip = start_row
+    for i in range(parquet_file.num_row_groups):
+        num_rows = parquet_file.metadata.row_group(i).num_rows
+        if skip >= num_rows and not row_groups:
+            skip -= num_rows
+        else:
+            row_groups.append(i)
+
+    for batch in parquet_file.iter_batches(batch_size=chunksize, row_groups=row_groups, columns=columns):
+        chunk = batch.to_pandas()
+        if skip:
+            chunk, skip = chunk.iloc[skip:], max(0, skip - len(chunk))
+            if chunk.empty:
+                continue
+        yield chunk
+
+SAMPLING_METHODS = ['head', 'reservoir', 'hash']
+
+def load_sample(file_path, sample_size=None, columns=None, method='reservoir', chunksize=100000, random_state=42):
+    """
+    Stream a CSV or Parquet file once and keep an exact-size sample of its rows.
+
+    'head' keeps the first sample_size rows. 'reservoir' keeps a uniform random
+    sample, and 'hash' keeps the rows with the smallest content hash, which gives
+    the same sample for the same rows whatever their order in the file. Identical
+    rows share a key, so they are usually kept or dropped together, but copies whose
+    key falls exactly on the cutoff can be split. Both give every row a key and keep
+    the sample_size smallest keys: rows whose key is above the current cutoff are
+    dropped as they arrive, so memory stays around the sample plus one chunk.
+
+    Parameters:
+    file_path (str): Path to the CSV or Parquet file
+    sample_size (int): Number of rows to keep, a positive number (all rows if None)
+    columns (list): Columns to read (all columns if None)
+    method (str): One of SAMPLING_METHODS
+    chunksize (int): Number of rows read at a time
+    random_state (int): Seed for reservoir sampling, or salt for hash sampling
+
+    Returns:
+    pandas.DataFrame: Sampled rows in file order
+    """
+    import numpy as np
+    import pandas as pd
+
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method {method!r}; expected one of {SAMPLING_METHODS}")
+    if sample_size is not None and sample_size <= 0:
+        raise ValueError(f"sample_size must be a positive number of rows, got {sample_size}")
+
+    if sample_size is None or method == 'head':
+        chunks = list(iter_data_chunks(file_path, chunksize=chunksize, columns=columns, max_rows=sample_size))
+        if not chunks:
+            return pd.DataFrame(columns=columns or REVIEW_COLUMNS)
+        return pd.concat(chunks, ignore_index=True)
+
+    rng = np.random.default_rng(random_state)
+    hash_key = str(random_state).rjust(16, '0')[-16:]
+    kept, kept_keys = [], []
+    n_kept = 0
+    cutoff = None
+
+    def compact():
+        # Keep the sample_size smallest keys, in file order
+        df = pd.concat(kept, ignore_index=True)
+        keys = np.concatenate(kept_keys)
+        if len(df) > sample_size:
+            index = np.sort(np.argpartition(keys, sample_size - 1)[:sample_size])
+            df, keys = df.iloc[index], keys[index]
+        return df, keys
+
+    for chunk in iter_data_chunks(file_path, chunksize=chunksize, columns=columns):
+        if method == 'reservoir':
+            keys = rng.random(len(chunk))
+        else:
+            keys = pd.util.hash_pandas_object(chunk, index=False, hash_key=hash_key).to_numpy()
+
+        if cutoff is not None:
+            mask = keys < cutoff
+            chunk, keys = chunk[mask], keys[mask]
+        kept.append(chunk)
+        kept_keys.append(keys)
+        n_kept += len(chunk)
+
+        # Compacting only once twice the sample has built up keeps the copying linear
+        if n_kept >= 2 * sample_size:
+            df, keys = compact()
+            kept, kept_keys, n_kept = [df], [keys], len(df)
+            cutoff = keys.max()
+
+    if not kept:
+        return pd.DataFrame(columns=columns or REVIEW_COLUMNS)
+    df, _ = compact()
+    return df.reset_index(drop=True)
+
+def _review_table(chunk):
+    """
+    Convert a chunk of review rows to an Arrow table, storing Rating as an 8-bit integer.
+    """
+    import pyarrow as pa
+
+    types = {'Rating': pa.int8(), 'Title': pa.string(), 'Text': pa.string()}
+    schema = pa.schema([(column, types[column]) for column in chunk.columns])
+    return pa.Table.from_arrays([pa.array(chunk[column], type=types[column], from_pandas=True)
+                                 for column in chunk.columns], schema=schema)
+
+def convert_csv_to_parquet(csv_path, parquet_path, row_group_size=100000):
+    """
+    Convert an Amazon review CSV file (Rating,Title,Text without a header) to Parquet.
+
+    The file is converted in one streaming pass of row_group_size rows at a time.
+    Rating is stored as an 8-bit integer and each chunk becomes one row group, so
+    later reads can skip unneeded columns and row ranges without parsing text.
+
+    Parameters:
+    csv_path (str): Path to the CSV file
+    parquet_path (str): Path of the Parquet file to write
+    row_group_size (int): Number of rows per row group
+
+    Returns:
+    int: Number of rows written
+    """
+    import pyarrow.parquet as pq
+
+    directory = os.path.dirname(parquet_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so readers never see a partial file
+    tmp_path = f"{parquet_path}.tmp"
+    n_rows = 0
+    writer = None
+    try:
+        for chunk in iter_data_chunks(csv_path, chunksize=row_group_size):
+            table = _review_table(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema, compression='zstd')
+            writer.write_table(table, row_group_size=row_group_size)
+            n_rows += len(chunk)
+            print(f"Converted {n_rows} rows")
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows to convert in {csv_path}")
+    os.replace(tmp_path, parquet_path)
+
+    return n_rows
+
+# Partition files written by split_data, and the manifest describing them
+SPLIT_FILES = {'train': 'train.parquet', 'test': 'test.parquet'}
+SPLIT_MANIFEST = 'split.json'
+
+def hash_partition(texts, test_size=0.2, random_state=42):
+    """
+    Assign texts to the test partition by a stable hash of their content.
+
+    The hash does not depend on the row order, the sample size or the pandas
+    version, so a review always lands in the same partition, and identical
+    reviews always land together. It is also independent of the label, so every
+    class is split in the same proportion up to sampling noise.
+
+    Parameters:
+    texts (iterable): Review texts
+    test_size (float): Fraction of texts assigned to the test partition
+    random_state (int): Salt of the hash; a different value gives a different split
+
+    Returns:
+    numpy.ndarray: Boolean mask, True for texts in the test partition
+    """
+    import numpy as np
+
+    salt = str(random_state).encode('utf-8')[:16]
+    cutoff = int(test_size * 2**64)
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(str(text).encode('utf-8'), digest_size=8, salt=salt).digest(), 'big') < cutoff
+         for text in texts),
+        dtype=bool, count=len(texts)
+    )
+
+def split_data(file_path, output_dir, test_size=0.2, random_state=42, chunksize=100000,
+               rating_column='Rating', text_column='Text'):
+    """
+    Split a CSV or Parquet file into train and test partitions in one streaming pass.
+
+    Each review is assigned by hash_partition on its text and appended to
+    output_dir/train.parquet or output_dir/test.parquet. A split.json manifest
+    records the parameters and the row counts per partition and rating. Later
+    runs read only the partition they need instead of splitting in memory.
+
+    Parameters:
+    file_path (str): Path to the CSV or Parquet file
+    output_dir (str): Directory for the partitions and the manifest
+    test_size (float): Fraction of reviews assigned to the test partition
+    random_state (int): Salt of the partition hash
+    chunksize (int): Number of rows read at a time
+    rating_column (str): Name of the column containing ratings
+    text_column (str): Name of the column containing text
+
+    Returns:
+    dict: The manifest written to split.json
+    """
+    import pyarrow.parquet as pq
+
+    if not 0 < test_size < 1:
+        raise ValueError(f"test_size must be between 0 and 1, got {test_size}")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Write to temporary files first so readers never see a partial split
+    paths = {name: os.path.join(output_dir, file_name) for name, file_name in SPLIT_FILES.items()}
+    writers = {}
+    counts = {name: {} for name in SPLIT_FILES}
+    try:
+        for chunk in iter_data_chunks(file_path, chunksize=chunksize):
+            is_test = hash_partition(chunk[text_column], test_size=test_size, random_state=random_state)
+            for name, rows in [('train', chunk[~is_test]), ('test', chunk[is_test])]:
+                table = _review_table(rows)
+                if name not in writers:
+                    writers[name] = pq.ParquetWriter(f"{paths[name]}.tmp", table.schema, compression='zstd')
+                writers[name].write_table(table)
+                for rating, count in rows[rating_column].value_counts().items():
+                    counts[name][str(rating)] = counts[name].get(str(rating), 0) + int(count)
+            n_rows = sum(sum(partition.values()) for partition in counts.values())
+            print(f"Split {n_rows} rows")
+    finally:
+        for writer in writers.values():
+            writer.close()
+    if not writers:
+        raise ValueError(f"No rows to split in {file_path}")
+
+    for name, path in paths.items():
+        os.replace(f"{path}.tmp", path)
+
+    manifest = {
+        'source': os.path.abspath(file_path),
+        'test_size': test_size,
+        'random_state': random_state,
+        'text_column': text_column,
+        'files': SPLIT_FILES,
+        'rows': {name: sum(partition.values()) for name, partition in counts.items()},
+        'ratings': counts
+    }
+    with open(os.path.join(output_dir, SPLIT_MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+def create_sentiment_labels(df, rating_column, text_column, inplace=False):
     """
     Create sentiment labels based on ratings.
 
+    The labels are computed with vectorized operations and stored compactly:
+    'sentiment' as a category column and 'sentiment_binary' as int8. No column
+    of the input is copied; unless inplace is True a shallow copy gets the new
+    columns and the input is left unchanged.
+
     Parameters:
     df (pandas.DataFrame): Input dataframe
     rating_column (str): Name of the column containing ratings
     text_column (str): Name of the column containing text
+    inplace (bool): Add the label columns to df itself
 
     Returns:
-    pandas.DataFrame: Dataframe with sentiment labels
+    pandas.DataFrame: Dataframe with sentiment labels (df itself if inplace)
     """
-    df_copy = df.copy()
+    import numpy as np
+    import pandas as pd
+
+    if not inplace:
+        df = df.copy(deep=False)
 
-    # Create sentiment labels based on rating
     # For this dataset with only ratings 1 and 2:
-    # Rating 1: Negative, Rating 2: Positive
-    df_copy['sentiment'] = df_copy[rating_column].apply(
-        lambda x: 'negative' if x == 1 else 'positive'
-    )
+    # Rating 1: Negative (0), Rating 2: Positive (1)
+    binary = (df[rating_column] != 1).to_numpy(dtype=np.int8)
+    df['sentiment'] = pd.Categorical.from_codes(binary, categories=['negative', 'positive'])
+    df['sentiment_binary'] = binary
 
-    # Convert sentiment to binary (0 for negative, 1 for positive)
-    df_copy['sentiment_binary'] = df_copy['sentiment'].apply(
-        lambda x: 0 if x == 'negative' else 1
-    )
-    
-    df_binary = df_copy.copy()
+    return df
 
-    return df_binary
+def iter_labeled_chunks(file_path, preprocessor, rating_column, text_column, chunksize=100000,
+                        max_rows=None, n_jobs=1):
+    """
+    Stream labeled and preprocessed chunks of a CSV or Parquet file.
+
+    With n_jobs > 1 one pool of preprocessing workers is started for the whole
+    stream, so NLTK is loaded once per worker rather than once per chunk.
+
+    Parameters:
+    file_path (str): Path to the CSV or Parquet file
+    preprocessor (TextPreprocessor): Preprocessor applied to each chunk
+    rating_column (str): Name of the column containing ratings
+    text_column (str): Name of the column containing text
+    chunksize (int): Number of rows per chunk
+    max_rows (int): Maximum number of rows to yield (all rows if None)
+    n_jobs (int): Number of preprocessing worker processes (-1 uses all CPU cores)
+
+    Yields:
+    pandas.DataFrame: Chunk with sentiment labels and the preprocessed text column
+    """
+    pool = preprocessor.open_pool(n_jobs)
+    try:
+        for chunk in iter_data_chunks(file_path, chunksize=chunksize, columns=[rating_column, text_column],
+                                      max_rows=max_rows):
+            chunk_labeled = create_sentiment_labels(chunk, rating_column, text_column)
+            yield preprocessor.preprocess_dataframe(chunk_labeled, text_column, inplace=True, pool=pool)
+    finally:
+        if pool is not None:
+            pool.terminate()
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,134 @@
+import json
+import os
+import pickle
+import shutil
+import numpy as np
+from scipy.sparse import csr_matrix
+
+class FeatureStore:
+    """
+    A directory holding a fitted vectorizer and vectorized train/test splits.
+
+    Sparse matrices are stored as their raw CSR arrays (data, indices, indptr) in
+    .npy files, so they can be memory-mapped instead of read into private memory.
+    Model comparisons and hyperparameter sweeps can then reuse the same features
+    instead of re-vectorizing the corpus for every model.
+    """
+
+    MATRICES = ['X_train', 'X_test']
+    LABELS = ['y_train', 'y_test']
+
+    def __init__(self, feature_dir):
+        """
+        Initialize the feature store.
+
+        Parameters:
+        feature_dir (str): Directory holding the stored features
+        """
+        self.feature_dir = feature_dir
+        self.manifest_path = os.path.join(feature_dir, 'manifest.json')
+
+    def exists(self):
+        """
+        Check whether features have been saved to this store.
+
+        Returns:
+        bool: True if a complete feature set is present
+        """
+        return os.path.exists(self.manifest_path)
+
+    def save(self, vectorizer, X_train, X_test, y_train, y_test):
+        """
+        Save a fitted vectorizer and the vectorized train/test splits.
+
+        The store is written to a sibling temporary directory and swapped into place
+        once complete, so an existing store is never left with its old manifest next
+        to half-written arrays, and processes that have it memory-mapped keep reading
+        the old files.
+
+        Parameters:
+        vectorizer: Fitted vectorizer used to produce the matrices
+        X_train (scipy.sparse matrix): Vectorized training data
+        X_test (scipy.sparse matrix): Vectorized testing data
+        y_train (array-like): Training sentiment labels (numbers or strings)
+        y_test (array-like): Testing sentiment labels (numbers or strings)
+
+        Raises:
+        ValueError: If labels are neither numeric nor strings
+        """
+        labels = [self._label_array(name, y) for name, y in zip(self.LABELS, [y_train, y_test])]
+
+        feature_dir = os.path.normpath(self.feature_dir)
+        tmp_dir, old_dir = f"{feature_dir}.tmp", f"{feature_dir}.old"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        with open(os.path.join(tmp_dir, 'vectorizer.pkl'), 'wb') as f:
+            pickle.dump(vectorizer, f)
+
+        manifest = {'matrices': {}}
+        for name, matrix in zip(self.MATRICES, [X_train, X_test]):
+            matrix = csr_matrix(matrix)
+            for part in ['data', 'indices', 'indptr']:
+                np.save(os.path.join(tmp_dir, f'{name}.{part}.npy'), getattr(matrix, part))
+            manifest['matrices'][name] = list(matrix.shape)
+
+        for name, array in zip(self.LABELS, labels):
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), array)
+
+        # The manifest is written last so a partially written store is never used
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+        # Swap the complete store into place; until then readers see the old store or none
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(feature_dir):
+            os.replace(feature_dir, old_dir)
+        os.replace(tmp_dir, feature_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+        print(f"Features saved to {self.feature_dir}")
+
+    @staticmethod
+    def _label_array(name, labels):
+        """
+        Convert labels to an array that loads without pickle: object arrays of strings
+        (e.g. a str or category Series) become fixed-width unicode.
+        """
+        array = np.asarray(labels)
+        if array.dtype == object:
+            if not all(isinstance(label, str) for label in array):
+                raise ValueError(f"{name} must hold numeric or string labels to be stored")
+            array = array.astype(str)
+        return array
+
+    def load(self, mmap=True):
+        """
+        Load the stored vectorizer and features.
+
+        Parameters:
+        mmap (bool): Memory-map the arrays instead of reading them into memory
+
+        Returns:
+        tuple: vectorizer, X_train, X_test, y_train, y_test
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"No features found in {self.feature_dir}")
+
+        with open(self.manifest_path, 'r') as f:
+            manifest = json.load(f)
+        with open(os.path.join(self.feature_dir, 'vectorizer.pkl'), 'rb') as f:
+            vectorizer = pickle.load(f)
+
+        # Copy-on-write mapping: pages stay shared with the file unless an estimator writes to them
+        mmap_mode = 'c' if mmap else None
+        matrices = []
+        for name in self.MATRICES:
+            parts = [np.load(os.path.join(self.feature_dir, f'{name}.{part}.npy'), mmap_mode=mmap_mode)
+                     for part in ['data', 'indices', 'indptr']]
+            matrices.append(csr_matrix(tuple(parts), shape=tuple(manifest['matrices'][name]), copy=False))
+
+        labels = [np.load(os.path.join(self.feature_dir, f'{name}.npy'), mmap_mode=mmap_mode) for name in self.LABELS]
+
+        print(f"Features loaded from {self.feature_dir}")
+        return (vectorizer, *matrices, *labels)
@@ -0,0 +1,765 @@
+import datetime
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Fields of a review history entry, in column order
+HISTORY_FIELDS = ['id', 'text', 'category', 'rating', 'sentiment', 'confidence', 'timestamp']
+
+def match_filters(entry, sentiment=None, category=None, start=None, end=None, search=None):
+    """
+    Check whether a history entry matches the history filters.
+
+    Parameters:
+    entry (dict): History entry
+    sentiment (str): Required sentiment ('Positive' or 'Negative')
+    category (str): Required product category
+    start (str): Earliest timestamp, inclusive ("%Y-%m-%d %H:%M:%S")
+    end (str): Latest timestamp, exclusive ("%Y-%m-%d %H:%M:%S")
+    search (str): Case-insensitive substring of the review text
+
+    Returns:
+    bool: True if the entry matches every given filter
+    """
+    if sentiment is not None and entry['sentiment'] != sentiment:
+        return False
+    if category is not None and entry['category'] != category:
+        return False
+    if start is not None and entry['timestamp'] < start:
+        return False
+    if end is not None and entry['timestamp'] >= end:
+        return False
+    if search and search.lower() not in entry['text'].lower():
+        return False
+    return True
+
+def format_cursor(cursor):
+    """
+    Encode a (timestamp, id) page cursor returned by query() as "timestamp|id".
+    """
+    timestamp, review_id = cursor
+    return f"{timestamp or ''}|{review_id}"
+
+def parse_cursor(cursor):
+    """
+    Decode a page cursor encoded by format_cursor.
+
+    Returns:
+    tuple: (timestamp, id)
+
+    Raises:
+    ValueError: If the cursor is malformed
+    """
+    timestamp, separator, review_id = cursor.rpartition('|')
+    if not separator:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return timestamp, int(review_id)
+
+class HistoryAggregates:
+    """
+    Running totals of the review history, grouped into buckets.
+
+    Every review updates a fixed number of buckets: the overall total, its category,
+    its rating, its month and its day. Each bucket holds positive and negative counts
+    and sums of confidence and rating, so adding or removing a review is O(1) and
+    building the insights is O(number of buckets), independent of the history size.
+    """
+
+    # Per-bucket values: positive, negative, confidence sum, rating sum, rated reviews
+    VALUE_FIELDS = ['positive', 'negative', 'confidence_sum', 'rating_sum', 'rating_count']
+
+    def __init__(self):
+        """
+        Initialize empty aggregates.
+        """
+        self.buckets = {}
+
+    @staticmethod
+    def buckets_of(entry):
+        """
+        Get the (dimension, bucket) keys a review contributes to.
+        """
+        keys = [('total', ''), ('category', entry['category'] or 'Other')]
+        rating = parse_rating(entry['rating'])
+        if rating is not None:
+            keys.append(('rating', str(rating)))
+        timestamp = entry['timestamp'] or ''
+        if timestamp:
+            keys.append(('month', timestamp[:7]))
+            keys.append(('day', timestamp[:10]))
+        return keys
+
+    @staticmethod
+    def values_of(entry, sign=1):
+        """
+        Get the bucket values of a review (negated when sign is -1).
+        """
+        rating = parse_rating(entry['rating'])
+        return [
+            sign * (entry['sentiment'] == 'Positive'),
+            sign * (entry['sentiment'] == 'Negative'),
+            sign * (entry['confidence'] or 0.0),
+            sign * (rating or 0),
+            sign * (rating is not None)
+        ]
+
+    def add(self, entry, sign=1):
+        """
+        Add a review to the aggregates, or remove it with sign=-1.
+        """
+        values = self.values_of(entry, sign)
+        for key in self.buckets_of(entry):
+            bucket = self.buckets.setdefault(key, [0, 0, 0.0, 0, 0])
+            for i, value in enumerate(values):
+                bucket[i] += value
+
+    def insights(self, months=6, days=30):
+        """
+        Build the insights shown by the dashboard and insights pages.
+
+        Parameters:
+        months (int): Number of most recent months in the trend
+        days (int): Number of most recent days in the daily counts
+
+        Returns:
+        dict: Totals, percentages, averages, trend, category and rating breakdowns
+        """
+        positive, negative, confidence_sum, rating_sum, rating_count = self.buckets.get(('total', ''), [0, 0, 0.0, 0, 0])
+        total = positive + negative
+
+        def dimension(name):
+            return {bucket: values for (dim, bucket), values in self.buckets.items() if dim == name and values[0] + values[1] > 0}
+
+        def percentages(values):
+            count = values[0] + values[1]
+            return round(100 * values[0] / count, 1), round(100 * values[1] / count, 1)
+
+        month_buckets = dimension('month')
+        trend_months = sorted(month_buckets)[-months:]
+        trend = [percentages(month_buckets[month]) for month in trend_months]
+
+        category_buckets = dimension('category')
+        categories = sorted(category_buckets, key=lambda c: category_buckets[c][0] + category_buckets[c][1], reverse=True)
+        category_split = [percentages(category_buckets[category]) for category in categories]
+
+        rating_buckets = dimension('rating')
+        day_buckets = dimension('day')
+        recent_days = sorted(day_buckets)[-days:]
+
+        return {
+            'total_reviews': total,
+            'positive_reviews': positive,
+            'negative_reviews': negative,
+            'positive_percentage': round(100 * positive / total, 1) if total else 0,
+            'negative_percentage': round(100 * negative / total, 1) if total else 0,
+            'average_rating': round(rating_sum / rating_count, 2) if rating_count else None,
+            'average_confidence': round(confidence_sum / total, 4) if total else None,
+            'trend_data': {
+                'labels': [datetime.datetime.strptime(month, "%Y-%m").strftime("%b %Y") for month in trend_months],
+                'positive': [split[0] for split in trend],
+                'negative': [split[1] for split in trend]
+            },
+            'category_data': {
+                'labels': categories,
+                'positive': [split[0] for split in category_split],
+                'negative': [split[1] for split in category_split],
+                'counts': [category_buckets[c][0] + category_buckets[c][1] for c in categories]
+            },
+            'rating_data': {
+                'labels': [str(rating) for rating in range(1, 6)],
+                'counts': [sum(rating_buckets.get(str(rating), [0, 0])[:2]) for rating in range(1, 6)]
+            },
+            'daily_data': {
+                'labels': recent_days,
+                'positive': [day_buckets[day][0] for day in recent_days],
+                'negative': [day_buckets[day][1] for day in recent_days]
+            }
+        }
+
+def parse_rating(rating):
+    """
+    Parse a 1-5 star rating, or return None if it is missing or invalid.
+    """
+    try:
+        rating = int(rating)
+    except (TypeError, ValueError):
+        return None
+    return rating if 1 <= rating <= 5 else None
+
+class InMemoryHistoryStore:
+    """
+    Review history kept in a dictionary of the current process.
+
+    Entries are lost on restart and are not shared between server workers; use
+    SQLiteHistoryStore for those. Lookups and deletes by id are O(1).
+    """
+
+    def __init__(self):
+        """
+        Initialize the store.
+        """
+        self._entries = OrderedDict()
+        self._next_id = 1
+        self._revision = 0
+        self._aggregates = HistoryAggregates()
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        """
+        Add a review to the history and assign its id.
+
+        Parameters:
+        entry (dict): Review fields without an id
+
+        Returns:
+        dict: The stored entry including its id
+        """
+        with self._lock:
+            entry = {**entry, 'id': self._next_id}
+            self._next_id += 1
+            self._entries[entry['id']] = entry
+            self._aggregates.add(entry)
+            self._revision += 1
+        return entry
+
+    def get(self, review_id):
+        """
+        Get a review by id, or None if it does not exist.
+        """
+        return self._entries.get(review_id)
+
+    def delete(self, review_id):
+        """
+        Delete a review by id.
+
+        Returns:
+        bool: True if the review existed
+        """
+        with self._lock:
+            entry = self._entries.pop(review_id, None)
+            if entry is None:
+                return False
+            self._aggregates.add(entry, sign=-1)
+            self._revision += 1
+            return True
+
+    def list_all(self):
+        """
+        Get all reviews in id order.
+        """
+        with self._lock:
+            return list(self._entries.values())
+
+    def count(self):
+        """
+        Get the number of stored reviews.
+        """
+        return len(self._entries)
+
+    def query(self, cursor=None, limit=50, **filters):
+        """
+        Get one page of reviews matching the filters, newest first.
+
+        Reviews are ordered by (timestamp, id), like in SQLiteHistoryStore; within one
+        process that is the insertion order.
+
+        Parameters:
+        cursor (tuple): Only return reviews before this (timestamp, id) (the next_cursor of the previous page)
+        limit (int): Maximum number of reviews returned
+        **filters: Filters accepted by match_filters
+
+        Returns:
+        tuple: (list of reviews, cursor of the next page or None)
+        """
+        with self._lock:
+            entries = list(reversed(self._entries.values()))
+
+        page = []
+        for entry in entries:
+            if cursor is not None and (entry['timestamp'] or '', entry['id']) >= cursor:
+                continue
+            if match_filters(entry, **filters):
+                if len(page) == limit:
+                    last = page[-1]
+                    return page, (last['timestamp'] or '', last['id'])
+                page.append(entry)
+        return page, None
+
+    def summarize(self, **filters):
+        """
+        Summarize the reviews matching the filters.
+
+        Returns:
+        dict: total, positive and negative counts and the average confidence
+        """
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if match_filters(entry, **filters)]
+        confidences = [entry['confidence'] for entry in entries]
+        return {
+            'total': len(entries),
+            'positive': sum(1 for entry in entries if entry['sentiment'] == 'Positive'),
+            'negative': sum(1 for entry in entries if entry['sentiment'] == 'Negative'),
+            'average_confidence': sum(confidences) / len(confidences) if confidences else 0.0
+        }
+
+    def insights(self):
+        """
+        Get the insights built from the running aggregates (see HistoryAggregates.insights).
+        """
+        with self._lock:
+            return self._aggregates.insights()
+
+    def revision(self):
+        """
+        Get a number that changes whenever a review is added or deleted.
+        """
+        return self._revision
+
+    def flush(self):
+        """
+        Nothing to flush: every write is applied immediately.
+        """
+
+    def close(self):
+        """
+        Nothing to close for an in-memory store.
+        """
+
+class SQLiteHistoryStore:
+    """
+    Review history in an embedded SQLite database shared by all server workers.
+
+    Requests never wait for the disk: add() assigns the id immediately and queues the
+    row for a background writer that inserts queued rows in one transaction per batch.
+    Ids are reserved from the database in blocks, so workers never hand out the same
+    id and ids are not reused after deletes. With several workers ids do not follow
+    insertion time, so the history is ordered by (timestamp, id) instead. Reads flush
+    pending writes first, so a worker always sees its own reviews.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS reviews (
+            id INTEGER PRIMARY KEY,
+            text TEXT NOT NULL,
+            category TEXT,
+            rating TEXT,
+            sentiment TEXT,
+            confidence REAL,
+            timestamp TEXT
+        )""",
+        # Every index ends with the rowid (id), so these serve the (timestamp, id) page order
+        "CREATE INDEX IF NOT EXISTS idx_reviews_timestamp ON reviews (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_reviews_sentiment_timestamp ON reviews (sentiment, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_reviews_category_timestamp ON reviews (category, timestamp)",
+        """CREATE TABLE IF NOT EXISTS aggregates (
+            dimension TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            positive INTEGER NOT NULL,
+            negative INTEGER NOT NULL,
+            confidence_sum REAL NOT NULL,
+            rating_sum INTEGER NOT NULL,
+            rating_count INTEGER NOT NULL,
+            PRIMARY KEY (dimension, bucket)
+        )""",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', 0)"
+    ]
+
+    # Every write transaction bumps the revision, so clients can tell whether anything changed
+    BUMP_REVISION = "UPDATE meta SET value = value + 1 WHERE key = 'revision'"
+
+    # Adds bucket deltas to the stored aggregates
+    UPDATE_AGGREGATES = (
+        "INSERT INTO aggregates (dimension, bucket, positive, negative, confidence_sum, rating_sum, rating_count) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (dimension, bucket) DO UPDATE SET "
+        "positive = positive + excluded.positive, negative = negative + excluded.negative, "
+        "confidence_sum = confidence_sum + excluded.confidence_sum, "
+        "rating_sum = rating_sum + excluded.rating_sum, rating_count = rating_count + excluded.rating_count"
+    )
+
+    def __init__(self, db_path, id_block_size=1000, batch_size=500, flush_interval=0.05, write_retries=3):
+        """
+        Initialize the store and create the database schema if needed.
+
+        Parameters:
+        db_path (str): Path of the SQLite database file
+        id_block_size (int): Number of ids reserved from the database at a time
+        batch_size (int): Maximum number of rows inserted in one transaction
+        flush_interval (float): Seconds the writer waits for more rows before committing
+        write_retries (int): Attempts at writing a batch before it is written row by row
+        """
+        self.db_path = db_path
+        self.id_block_size = id_block_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_retries = write_retries
+        self._local = threading.local()
+        self._id_lock = threading.Lock()
+        self._next_id = None
+        self._id_limit = None
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Connections are opened per thread on first use, so none is inherited by forked workers
+        connection = sqlite3.connect(db_path, timeout=30)
+        with connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            # Databases created before the aggregates table existed are backfilled once
+            if connection.execute("SELECT NOT EXISTS (SELECT 1 FROM aggregates) AND EXISTS (SELECT 1 FROM reviews)").fetchone()[0]:
+                self._rebuild_aggregates(connection)
+        connection.close()
+
+    def add(self, entry):
+        """
+        Add a review to the history and assign its id. The row is written in the background.
+
+        Parameters:
+        entry (dict): Review fields without an id
+
+        Returns:
+        dict: The stored entry including its id
+
+        Raises:
+        ValueError: If a review field is missing
+        """
+        # Rejected here, before an id is handed out, rather than failing in the writer
+        missing = [field for field in HISTORY_FIELDS if field != 'id' and field not in entry]
+        if missing:
+            raise ValueError(f"Review is missing fields: {', '.join(missing)}")
+
+        entry = {**entry, 'id': self._allocate_id()}
+        self._ensure_writer()
+        self._queue.put(entry)
+        return entry
+
+    def get(self, review_id):
+        """
+        Get a review by id, or None if it does not exist.
+        """
+        self.flush()
+        row = self._connection().execute(
+            f"SELECT {', '.join(HISTORY_FIELDS)} FROM reviews WHERE id = ?", (review_id,)
+        ).fetchone()
+        return self._row_to_entry(row) if row is not None else None
+
+    def delete(self, review_id):
+        """
+        Delete a review by id.
+
+        Returns:
+        bool: True if the review existed
+        """
+        self.flush()
+        connection = self._connection()
+        with connection:
+            # Only the worker whose DELETE removed the row gets it back, so concurrent
+            # deletes of the same review subtract it from the aggregates once
+            row = connection.execute(
+                f"DELETE FROM reviews WHERE id = ? RETURNING {', '.join(HISTORY_FIELDS)}", (review_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._update_aggregates(connection, [self._row_to_entry(row)], sign=-1)
+            connection.execute(self.BUMP_REVISION)
+        return True
+
+    def list_all(self):
+        """
+        Get all reviews in id order.
+        """
+        self.flush()
+        rows = self._connection().execute(
+            f"SELECT {', '.join(HISTORY_FIELDS)} FROM reviews ORDER BY id"
+        ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def count(self):
+        """
+        Get the number of stored reviews.
+        """
+        self.flush()
+        return self._connection().execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def query(self, cursor=None, limit=50, **filters):
+        """
+        Get one page of reviews matching the filters, newest first.
+
+        Reviews are ordered by (timestamp, id): ids are handed out in per-worker blocks,
+        so on their own they do not follow insertion time. Pages are addressed by the
+        (timestamp, id) of their last review instead of an offset, so every page is an
+        index range scan no matter how deep the client has paged.
+
+        Parameters:
+        cursor (tuple): Only return reviews before this (timestamp, id) (the next_cursor of the previous page)
+        limit (int): Maximum number of reviews returned
+        **filters: Filters accepted by match_filters
+
+        Returns:
+        tuple: (list of reviews, cursor of the next page or None)
+        """
+        self.flush()
+        where, params = self._where_clause(**filters)
+        if cursor is not None:
+            where.append("(timestamp, id) < (?, ?)")
+            params.extend(cursor)
+
+        sql = f"SELECT {', '.join(HISTORY_FIELDS)} FROM reviews"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+
+        # One extra row tells whether there is a next page
+        rows = self._connection().execute(sql, params + [limit + 1]).fetchall()
+        page = [self._row_to_entry(row) for row in rows[:limit]]
+        next_cursor = (page[-1]['timestamp'], page[-1]['id']) if len(rows) > limit else None
+        return page, next_cursor
+
+    def summarize(self, **filters):
+        """
+        Summarize the reviews matching the filters.
+
+        Returns:
+        dict: total, positive and negative counts and the average confidence
+        """
+        self.flush()
+        where, params = self._where_clause(**filters)
+        sql = ("SELECT COUNT(*), COALESCE(SUM(sentiment = 'Positive'), 0), "
+               "COALESCE(SUM(sentiment = 'Negative'), 0), COALESCE(AVG(confidence), 0.0) FROM reviews")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        total, positive, negative, average_confidence = self._connection().execute(sql, params).fetchone()
+        return {
+            'total': total,
+            'positive': positive,
+            'negative': negative,
+            'average_confidence': average_confidence
+        }
+
+    def insights(self):
+        """
+        Get the insights built from the stored aggregates (see HistoryAggregates.insights).
+        """
+        self.flush()
+        aggregates = HistoryAggregates()
+        for dimension, bucket, *values in self._connection().execute(
+            f"SELECT dimension, bucket, {', '.join(HistoryAggregates.VALUE_FIELDS)} FROM aggregates"
+        ):
+            aggregates.buckets[(dimension, bucket)] = values
+        return aggregates.insights()
+
+    def revision(self):
+        """
+        Get a number that changes whenever a review is added or deleted by any worker.
+        """
+        self.flush()
+        return self._connection().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()[0]
+
+    def flush(self):
+        """
+        Wait until every review queued by this process has been written.
+        """
+        if self._writer is None:
+            return
+        # A writer that died with rows still queued is restarted so they are not lost
+        self._ensure_writer()
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """
+        Write pending reviews and close this thread's connection.
+        """
+        self.flush()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connection(self):
+        """
+        Get the SQLite connection of the calling thread.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _allocate_id(self):
+        """
+        Hand out the next id, reserving a new block from the database when the current one is used up.
+        """
+        with self._id_lock:
+            if self._next_id is None or self._next_id >= self._id_limit:
+                connection = self._connection()
+                with connection:
+                    # BEGIN IMMEDIATE takes the write lock so concurrent workers get disjoint blocks
+                    connection.execute("BEGIN IMMEDIATE")
+                    start = connection.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()[0]
+                    connection.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (start + self.id_block_size,))
+                self._next_id, self._id_limit = start, start + self.id_block_size
+            review_id = self._next_id
+            self._next_id += 1
+            return review_id
+
+    def _ensure_writer(self):
+        """
+        Start the background writer on first use, so it also runs in forked server workers.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name='history-writer', daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        """
+        Writer loop: collect queued rows and insert them in one transaction per batch.
+        """
+        while True:
+            # A flush request ends the batch early so flush() does not wait for the interval
+            items = [self._queue.get()]
+            while len(items) < self.batch_size and not isinstance(items[-1], threading.Event):
+                try:
+                    items.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
+
+            entries = [item for item in items if isinstance(item, dict)]
+            try:
+                if entries:
+                    self._write_batch(entries)
+            except Exception:
+                # Never let one batch kill the writer: later reviews would silently pile up
+                logger.exception("Unexpected error writing %d reviews to %s", len(entries), self.db_path)
+            finally:
+                # Wake up flush() callers once everything queued before them is written
+                for item in items:
+                    if isinstance(item, threading.Event):
+                        item.set()
+
+    def _write_batch(self, entries):
+        """
+        Insert a batch of reviews in one transaction, retrying transient errors such as a
+        locked database. If the batch still fails it is written row by row, so only the
+        rows that cannot be stored are dropped, each with a logged error.
+        """
+        for attempt in range(self.write_retries):
+            try:
+                self._insert(entries)
+                return
+            except sqlite3.OperationalError as e:
+                logger.warning("Writing %d reviews to %s failed (attempt %d of %d): %s",
+                               len(entries), self.db_path, attempt + 1, self.write_retries, e)
+                time.sleep(0.1 * 2 ** attempt)
+            except sqlite3.Error as e:
+                logger.warning("Writing %d reviews to %s failed: %s", len(entries), self.db_path, e)
+                break
+
+        for entry in entries:
+            try:
+                self._insert([entry])
+            except sqlite3.Error:
+                logger.exception("Dropped review %s: it could not be written to %s", entry['id'], self.db_path)
+
+    def _insert(self, entries):
+        """
+        Insert reviews and their aggregate deltas in one transaction.
+        """
+        columns = ', '.join(HISTORY_FIELDS)
+        placeholders = ', '.join('?' for _ in HISTORY_FIELDS)
+        rows = [tuple(entry[field] for field in HISTORY_FIELDS) for entry in entries]
+        connection = self._connection()
+        with connection:
+            connection.executemany(f"INSERT INTO reviews ({columns}) VALUES ({placeholders})", rows)
+            self._update_aggregates(connection, entries)
+            connection.execute(self.BUMP_REVISION)
+
+    def _update_aggregates(self, connection, entries, sign=1):
+        """
+        Apply the bucket deltas of added (sign=1) or deleted (sign=-1) reviews in the current transaction.
+        """
+        deltas = HistoryAggregates()
+        for entry in entries:
+            deltas.add(entry, sign)
+        connection.executemany(
+            self.UPDATE_AGGREGATES, [(dimension, bucket, *values) for (dimension, bucket), values in deltas.buckets.items()]
+        )
+
+    def _rebuild_aggregates(self, connection):
+        """
+        Recompute the aggregates from all stored reviews in the current transaction.
+        """
+        connection.execute("DELETE FROM aggregates")
+        cursor = connection.execute(f"SELECT {', '.join(HISTORY_FIELDS)} FROM reviews")
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            self._update_aggregates(connection, [self._row_to_entry(row) for row in rows])
+
+    @staticmethod
+    def _where_clause(sentiment=None, category=None, start=None, end=None, search=None):
+        """
+        Build the SQL conditions of the filters accepted by match_filters.
+
+        Returns:
+        tuple: (list of conditions, list of parameters)
+        """
+        where, params = [], []
+        for column, value in [('sentiment', sentiment), ('category', category)]:
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            where.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("timestamp < ?")
+            params.append(end)
+        if search:
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where.append("text LIKE ? ESCAPE '\\'")
+            params.append(f'%{escaped}%')
+        return where, params
+
+    @staticmethod
+    def _row_to_entry(row):
+        """
+        Convert a database row to a history entry.
+        """
+        return dict(zip(HISTORY_FIELDS, row))
+
+def create_history_store(backend='sqlite', db_path='data/review_history.db'):
+    """
+    Create a review history store.
+
+    Parameters:
+    backend (str): 'sqlite' for a database shared by all workers, or 'memory'
+    db_path (str): Path of the SQLite database file
+
+    Returns:
+    InMemoryHistoryStore or SQLiteHistoryStore: The history store
+    """
+    if backend == 'sqlite':
+        return SQLiteHistoryStore(db_path)
+    if backend == 'memory':
+        return InMemoryHistoryStore()
+    raise ValueError(f"Unsupported history store: {backend}")
@@ -0,0 +1,188 @@
+import queue
+import threading
+import time
+
+class Histogram:
+    """
+    A fixed-bucket histogram that is cheap enough to update on every request.
+    """
+
+    def __init__(self, bounds):
+        """
+        Initialize the histogram.
+
+        Parameters:
+        bounds (list): Ascending upper bounds of the buckets; larger values go to an overflow bucket
+        """
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Record one value.
+        """
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        """
+        Describe the histogram as a JSON-serializable dictionary. counts has one entry
+        per bound (values up to and including that bound) followed by the overflow bucket.
+        """
+        return {
+            'bounds': self.bounds,
+            'counts': self.counts,
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0.0,
+            'max': round(self.max, 3)
+        }
+
+class _PendingRequest:
+    """
+    An item waiting in the batcher queue for its result.
+    """
+
+    __slots__ = ['item', 'enqueued_at', 'done', 'result', 'error']
+
+    def __init__(self, item):
+        self.item = item
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class MicroBatcher:
+    """
+    Groups concurrent single-item requests into batches.
+
+    Callers block in submit() while a background thread collects items until either
+    max_batch_size items are queued or the first item has waited max_wait_ms. The
+    whole batch is then passed to one process_batch call and every caller receives
+    its own result. A longer wait trades single-request latency for throughput
+    under concurrent load.
+    """
+
+    BATCH_SIZE_BOUNDS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+    LATENCY_BOUNDS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000]
+
+    def __init__(self, process_batch, max_batch_size=32, max_wait_ms=2.0):
+        """
+        Initialize the micro-batcher.
+
+        Parameters:
+        process_batch (callable): Maps a list of items to a list of results of the same length
+        max_batch_size (int): Maximum number of items processed together
+        max_wait_ms (float): Maximum time the first item of a batch waits for more items
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms cannot be negative")
+
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batch_sizes = Histogram(self.BATCH_SIZE_BOUNDS)
+        self.queue_wait_ms = Histogram(self.LATENCY_BOUNDS_MS)
+        self.batch_time_ms = Histogram(self.LATENCY_BOUNDS_MS)
+
+    def submit(self, item, timeout=None):
+        """
+        Queue one item and wait for its result.
+
+        Parameters:
+        item: Item passed to process_batch as part of a batch
+        timeout (float): Seconds to wait for the result (wait indefinitely if None)
+
+        Returns:
+        The result of process_batch for this item
+        """
+        self._ensure_worker()
+        pending = _PendingRequest(item)
+        self._queue.put(pending)
+
+        if not pending.done.wait(timeout):
+            raise TimeoutError(f"No result within {timeout} seconds")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def stats(self):
+        """
+        Describe the batching behaviour as a JSON-serializable dictionary.
+        """
+        with self._stats_lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'queued': self._queue.qsize(),
+                'batch_size': self.batch_sizes.to_dict(),
+                'queue_wait_ms': self.queue_wait_ms.to_dict(),
+                'batch_time_ms': self.batch_time_ms.to_dict()
+            }
+
+    def _ensure_worker(self):
+        """
+        Start the worker thread on first use, so it also runs in forked server workers.
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._worker.start()
+
+    def _collect_batch(self):
+        """
+        Block for the first item, then gather more until the batch is full or the wait expires.
+        """
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """
+        Worker loop: collect a batch, process it and hand each result to its caller.
+        """
+        while True:
+            batch = self._collect_batch()
+            start_time = time.perf_counter()
+            try:
+                results = self.process_batch([pending.item for pending in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"process_batch returned {len(results)} results for {len(batch)} items")
+                for pending, result in zip(batch, results):
+                    pending.result = result
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            end_time = time.perf_counter()
+
+            with self._stats_lock:
+                self.batch_sizes.observe(len(batch))
+                self.batch_time_ms.observe((end_time - start_time) * 1000)
+                for pending in batch:
+                    self.queue_wait_ms.observe((start_time - pending.enqueued_at) * 1000)
+
+            for pending in batch:
+                pending.done.set()
@@ -1,30 +1,170 @@
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.svm import SVC
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 import pickle
+import copy
+import math
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Serving only needs TF-IDF + logistic regression. Other estimators, model selection
+# and metrics are imported where they are used to keep the web app's startup cheap.
+
+class CompiledLinearScorer:
+    """
+    A precompiled scorer for a TF-IDF + binary logistic regression pipeline.
+
+    Scoring a single text only needs a vocabulary lookup, term counts, L2 normalization
+    and a dot product, without going through TfidfVectorizer.transform and
+    LogisticRegression.predict. The idf weights and coefficients are gathered from the
+    fitted arrays as they are, so when they are memory-mapped from an mmap artifact the
+    server workers share their pages instead of each holding a copy (only the
+    vocabulary dictionary is built in every process).
+    """
+
+    def __init__(self, vectorizer, model):
+        """
+        Build the scorer from a fitted vectorizer and model.
+
+        Parameters:
+        vectorizer (TfidfVectorizer): Fitted TF-IDF vectorizer
+        model (LogisticRegression): Fitted binary logistic regression model
+        """
+        self.analyzer = vectorizer.build_analyzer()
+        self.vocabulary = vectorizer.vocabulary_
+        self.sublinear_tf = vectorizer.sublinear_tf
+        self.binary = vectorizer.binary
+
+        # Views, not copies, for the float64 arrays of a loaded mmap artifact
+        self.idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+        self.coef = np.asarray(model.coef_, dtype=np.float64)[0]
+        self.intercept = float(model.intercept_[0])
+        self.classes = model.classes_
+
+    @staticmethod
+    def supports(vectorizer, model):
+        """
+        Check whether a vectorizer and model can be compiled into a scorer.
+
+        Parameters:
+        vectorizer: Fitted vectorizer
+        model: Fitted model
+
+        Returns:
+        bool: True if the pipeline is a TF-IDF vectorizer with L2 norm and a binary logistic regression
+        """
+        return (
+            isinstance(vectorizer, TfidfVectorizer)
+            and isinstance(model, LogisticRegression)
+            and vectorizer.use_idf
+            and vectorizer.norm == 'l2'
+            and hasattr(vectorizer, 'idf_')
+            and hasattr(model, 'coef_')
+            and len(model.classes_) == 2
+        )
+
+    def decision_function(self, text):
+        """
+        Compute the logistic regression decision value for a single text.
+
+        Parameters:
+        text (str): Input text
+
+        Returns:
+        float: Signed distance to the decision boundary
+        """
+        vocabulary = self.vocabulary
+        counts = {}
+        for token in self.analyzer(text):
+            index = vocabulary.get(token)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        if not counts:
+            return self.intercept
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        if self.binary:
+            tf = np.ones(len(counts))
+        else:
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            if self.sublinear_tf:
+                tf = 1.0 + np.log(tf)
+
+        values = tf * self.idf[indices]
+        squared_norm = float(values @ values)
+        dot = float(values @ self.coef[indices])
+
+        return dot / math.sqrt(squared_norm) + self.intercept
+
+    def score(self, text):
+        """
+        Predict the label and probability of the predicted class for a single text.
+
+        Parameters:
+        text (str): Input text
+
+        Returns:
+        tuple: (predicted label, probability of that label)
+        """
+        decision = self.decision_function(text)
+
+        # Numerically stable logistic function
+        if decision >= 0:
+            positive_probability = 1.0 / (1.0 + math.exp(-decision))
+        else:
+            exp_decision = math.exp(decision)
+            positive_probability = exp_decision / (1.0 + exp_decision)
+
+        if decision > 0:
+            return self.classes[1], positive_probability
+        return self.classes[0], 1.0 - positive_probability
+
+# Identifies the directory-based artifact written by save_model(artifact_format='mmap')
+MMAP_ARTIFACT_FORMAT = 'sentiment-model-mmap'
+MMAP_MANIFEST = 'manifest.json'
+
+# Fitted attributes that inference never reads; dropped by save_model(slim=True).
+# stop_words_ holds every term pruned by max_features/min_df/max_df in older sklearn versions.
+TRAINING_ONLY_ATTRIBUTES = ['stop_words_', 'n_iter_', 'oob_score_', 'oob_decision_function_']
+
+def _strip_training_state(estimator):
+    """
+    Return a shallow copy of an estimator without its training-only attributes.
+    """
+    slim_estimator = copy.copy(estimator)
+    for name in TRAINING_ONLY_ATTRIBUTES:
+        if name in slim_estimator.__dict__:
+            delattr(slim_estimator, name)
+    return slim_estimator
 
 class SentimentModel:
     """
     A class for building, training, and evaluating sentiment analysis models.
     """
 
-    def __init__(self, model_type='logistic_regression'):
+    def __init__(self, model_type='logistic_regression', streaming=False, n_features=2**20):
         """
         Initialize the sentiment model.
 
         Parameters:
         model_type (str): Type of model to use. Options: 'logistic_regression', 'naive_bayes', 'svm', 'random_forest'
+        streaming (bool): Use a stateless hashing vectorizer and an incremental learner so the model
+            can be trained chunk by chunk with train_streaming(). Only 'logistic_regression' and
+            'naive_bayes' support streaming.
+        n_features (int): Number of hashed features when streaming
         """
         self.model_type = model_type
-        self.vectorizer = TfidfVectorizer(max_features=10000)
+        self.streaming = streaming
+        if streaming:
+            # Non-negative features so MultinomialNB can consume them too
+            self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False)
+        else:
+            self.vectorizer = TfidfVectorizer(max_features=10000)
         self.model = self._initialize_model()
+        self.scorer = None
         self.is_trained = False
 
     def _initialize_model(self):
@@ -34,13 +174,26 @@ class SentimentModel:
         Returns:
         sklearn model: Initialized model
         """
+        if self.streaming:
+            if self.model_type == 'logistic_regression':
+                # Logistic regression fitted by stochastic gradient descent supports partial_fit
+                return SGDClassifier(loss='log_loss', random_state=42)
+            elif self.model_type == 'naive_bayes':
+                from sklearn.naive_bayes import MultinomialNB
+                return MultinomialNB()
+            else:
+                raise ValueError(f"Model type {self.model_type} does not support streaming training")
+
         if self.model_type == 'logistic_regression':
             return LogisticRegression(random_state=42)
         elif self.model_type == 'naive_bayes':
+            from sklearn.naive_bayes import MultinomialNB
             return MultinomialNB()
         elif self.model_type == 'svm':
+            from sklearn.svm import SVC
             return SVC(kernel='linear', random_state=42)
         elif self.model_type == 'random_forest':
+            from sklearn.ensemble import RandomForestClassifier
             return RandomForestClassifier(n_estimators=100, random_state=42)
         else:
             raise ValueError(f"Unknown model type: {self.model_type}")
@@ -57,6 +210,8 @@ class SentimentModel:
         Returns:
         tuple: X_train, X_test, y_train, y_test
         """
+        from sklearn.model_selection import train_test_split
+
         # Extract features and target
         X = df[text_column]
         y = df[sentiment_column]
@@ -79,12 +234,120 @@ class SentimentModel:
         # Vectorize text data
         X_train_vectorized = self.vectorizer.fit_transform(X_train)
 
+        self.train_vectorized(X_train_vectorized, y_train)
+
+    def train_vectorized(self, X_train_vectorized, y_train):
+        """
+        Train the sentiment model on features already produced by self.vectorizer.
+
+        Parameters:
+        X_train_vectorized (scipy.sparse matrix): Vectorized training data
+        y_train (array-like): Training sentiment labels
+        """
         # Train the model
         self.model.fit(X_train_vectorized, y_train)
         self.is_trained = True
+        self._build_scorer()
 
         print(f"Model ({self.model_type}) trained successfully!")
 
+    def rank_features(self, X_train_vectorized, y_train, method='chi2'):
+        """
+        Rank the terms of the fitted vectorizer from most to least discriminative.
+
+        Parameters:
+        X_train_vectorized (scipy.sparse matrix): Training data vectorized by self.vectorizer
+        y_train (array-like): Training sentiment labels
+        method (str): 'chi2' ranks terms by their chi-squared statistic against the labels;
+            'coef' by the magnitude of their coefficient in a logistic regression trained
+            on every term
+
+        Returns:
+        numpy.ndarray: Column indices of the terms, most discriminative first
+        """
+        if method == 'chi2':
+            from sklearn.feature_selection import chi2
+
+            scores, _ = chi2(X_train_vectorized, y_train)
+        elif method == 'coef':
+            ranker = LogisticRegression(random_state=42, max_iter=1000)
+            ranker.fit(X_train_vectorized, y_train)
+            scores = np.abs(ranker.coef_).max(axis=0)
+        else:
+            raise ValueError(f"Unknown feature selection method: {method}")
+
+        # Terms that never occur get a NaN chi-squared statistic
+        scores = np.nan_to_num(scores, nan=0.0)
+        return np.argsort(-scores, kind='stable')
+
+    def select_features(self, keep, X_vectorized=None):
+        """
+        Cut the fitted vectorizer's vocabulary down to a subset of its terms.
+
+        The vocabulary and idf weights shrink together, so the saved artifact, its load
+        time and the compiled scorer shrink with them. Call this before training: the
+        model has to be trained on the reduced features.
+
+        Parameters:
+        keep (array-like): Column indices of the terms to keep, e.g. the first entries of rank_features()
+        X_vectorized (scipy.sparse matrix): Optional data vectorized with the full vocabulary
+
+        Returns:
+        scipy.sparse matrix: X_vectorized restricted to the kept terms and renormalized as
+            self.vectorizer.transform() would produce it, or None if X_vectorized is None
+        """
+        from sklearn.preprocessing import normalize
+
+        if self.is_trained:
+            raise ValueError("Features must be selected before the model is trained.")
+
+        keep = np.sort(np.asarray(keep))
+        terms = sorted(self.vectorizer.vocabulary_, key=self.vectorizer.vocabulary_.get)
+
+        # A vectorizer with a fixed vocabulary and preset idf weights, as _load_mmap_artifact builds
+        vectorizer = TfidfVectorizer(**{**self.vectorizer.get_params(), 'vocabulary': [terms[index] for index in keep]})
+        vectorizer.idf_ = np.asarray(self.vectorizer.idf_)[keep]
+        self.vectorizer = vectorizer
+
+        if X_vectorized is None:
+            return None
+        X_selected = X_vectorized[:, keep]
+        if self.vectorizer.norm:
+            X_selected = normalize(X_selected, norm=self.vectorizer.norm, copy=False)
+        return X_selected
+
+    def train_streaming(self, chunks, text_column, sentiment_column, classes=(0, 1)):
+        """
+        Train the model incrementally, one dataframe chunk at a time.
+
+        Memory stays bounded by the chunk size because the hashing vectorizer needs no
+        fitted vocabulary and the model is updated with partial_fit.
+
+        Parameters:
+        chunks (iterable): Dataframes containing the text and sentiment columns
+        text_column (str): Name of the column containing text
+        sentiment_column (str): Name of the column containing sentiment labels
+        classes (tuple): All sentiment labels that can appear in the data
+
+        Returns:
+        int: Number of training samples seen
+        """
+        if not self.streaming:
+            raise ValueError("Streaming training requires SentimentModel(streaming=True).")
+
+        n_samples = 0
+        for chunk in chunks:
+            X_chunk = self.vectorizer.transform(chunk[text_column])
+            self.model.partial_fit(X_chunk, chunk[sentiment_column], classes=list(classes))
+            n_samples += len(chunk)
+            print(f"Trained on {n_samples} samples")
+
+        self.is_trained = True
+        self._build_scorer()
+
+        print(f"Model ({self.model_type}) trained successfully!")
+        return n_samples
+
     def evaluate(self, X_test, y_test):
         """
         Evaluate the sentiment model.
@@ -102,6 +365,24 @@ class SentimentModel:
         # Vectorize test data
         X_test_vectorized = self.vectorizer.transform(X_test)
 
+        return self.evaluate_vectorized(X_test_vectorized, y_test)
+
+    def evaluate_vectorized(self, X_test_vectorized, y_test):
+        """
+        Evaluate the sentiment model on features already produced by self.vectorizer.
+
+        Parameters:
+        X_test_vectorized (scipy.sparse matrix): Vectorized testing data
+        y_test (array-like): Testing sentiment labels
+
+        Returns:
+        dict: Dictionary containing evaluation metrics
+        """
+        from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+        if not self.is_trained:
+            raise ValueError("Model is not trained yet. Call train() first.")
+
         # Make predictions
         y_pred = self.model.predict(X_test_vectorized)
 
@@ -123,6 +404,52 @@ class SentimentModel:
             'confusion_matrix': cm
         }
 
+    def evaluate_streaming(self, chunks, text_column, sentiment_column):
+        """
+        Evaluate the model over a held-out dataset, one dataframe chunk at a time.
+
+        Only the confusion matrix is accumulated, so memory does not grow with the dataset.
+
+        Parameters:
+        chunks (iterable): Dataframes containing the text and sentiment columns
+        text_column (str): Name of the column containing text
+        sentiment_column (str): Name of the column containing sentiment labels
+
+        Returns:
+        dict: Dictionary containing evaluation metrics and the number of samples
+        """
+        from sklearn.metrics import classification_report, confusion_matrix
+
+        if not self.is_trained:
+            raise ValueError("Model is not trained yet. Call train() first.")
+
+        labels = list(self.model.classes_)
+        cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        for chunk in chunks:
+            y_pred = self.predict_batch(chunk[text_column])
+            cm += confusion_matrix(chunk[sentiment_column], y_pred, labels=labels)
+
+        # Rebuild the report from the confusion matrix: one weighted sample per cell
+        y_true_cells = np.repeat(labels, len(labels))
+        y_pred_cells = np.tile(labels, len(labels))
+        n_samples = int(cm.sum())
+        accuracy = np.trace(cm) / n_samples if n_samples else 0.0
+        report = classification_report(y_true_cells, y_pred_cells, labels=labels, sample_weight=cm.ravel())
+
+        print(f"Model: {self.model_type}")
+        print(f"Accuracy: {accuracy:.4f}")
+        print("Classification Report:")
+        print(report)
+        print("Confusion Matrix:")
+        print(cm)
+
+        return {
+            'accuracy': accuracy,
+            'classification_report': report,
+            'confusion_matrix': cm,
+            'n_samples': n_samples
+        }
+
     def predict(self, text):
         """
         Predict sentiment for a single text.
@@ -136,6 +463,10 @@ class SentimentModel:
         if not self.is_trained:
             raise ValueError("Model is not trained yet. Call train() first.")
 
+        # Use the precompiled scorer when the pipeline supports it
+        if self.scorer is not None:
+            return self.scorer.score(text)[0]
+
         # Vectorize text
         text_vectorized = self.vectorizer.transform([text])
 
@@ -144,24 +475,114 @@ class SentimentModel:
 
         return prediction
 
-    def save_model(self, model_path):
+    def predict_with_score(self, text):
+        """
+        Predict sentiment for a single text together with the model's confidence.
+
+        The text is vectorized once and both values come from the same scoring pass.
+
+        Parameters:
+        text (str): Input text
+
+        Returns:
+        tuple: (predicted sentiment, score). The score is the probability of the predicted
+        class, or the absolute decision margin for models without probabilities (see score_type).
+        """
+        if not self.is_trained:
+            raise ValueError("Model is not trained yet. Call train() first.")
+
+        # Use the precompiled scorer when the pipeline supports it
+        if self.scorer is not None:
+            return self.scorer.score(text)
+
+        predictions, scores = self._predict_with_scores(self.vectorizer.transform([text]))
+        return predictions[0], float(scores[0])
+
+    def predict_batch(self, texts, return_scores=False):
+        """
+        Predict sentiment for a batch of texts in a single vectorization pass.
+
+        Parameters:
+        texts (list): Input texts
+        return_scores (bool): Also return the confidence score of each prediction
+
+        Returns:
+        numpy.ndarray: Predicted sentiments, or a tuple of (predictions, scores) when
+        return_scores is True (see predict_with_score for the meaning of the scores)
+        """
+        if not self.is_trained:
+            raise ValueError("Model is not trained yet. Call train() first.")
+
+        # Vectorize all texts into one sparse matrix
+        texts_vectorized = self.vectorizer.transform(texts)
+
+        if not return_scores:
+            return self.model.predict(texts_vectorized)
+
+        return self._predict_with_scores(texts_vectorized)
+
+    @property
+    def score_type(self):
+        """
+        Kind of score returned with predictions: 'probability' or 'margin'.
+        """
+        return 'probability' if hasattr(self.model, 'predict_proba') else 'margin'
+
+    def _predict_with_scores(self, X_vectorized):
+        """
+        Predict labels and confidence scores for vectorized texts with one model evaluation.
+
+        Parameters:
+        X_vectorized (scipy.sparse matrix): Vectorized texts
+
+        Returns:
+        tuple: (predictions, scores) as numpy arrays
+        """
+        classes = self.model.classes_
+
+        if hasattr(self.model, 'predict_proba'):
+            # Derive the labels from the probabilities so the model is only evaluated once
+            probabilities = self.model.predict_proba(X_vectorized)
+            best = probabilities.argmax(axis=1)
+            return classes[best], probabilities[np.arange(len(best)), best]
+
+        decision = self.model.decision_function(X_vectorized)
+        if decision.ndim == 1:
+            return classes[(decision > 0).astype(int)], np.abs(decision)
+        best = decision.argmax(axis=1)
+        return classes[best], decision[np.arange(len(best)), best]
+
+    def save_model(self, model_path, artifact_format='pickle', slim=False):
         """
         Save the trained model and vectorizer.
 
         Parameters:
-        model_path (str): Path to save the model
+        model_path (str): Path to save the model (a directory for the 'mmap' format)
+        artifact_format (str): 'pickle' for a single pickle file, or 'mmap' for a JSON manifest
+            plus raw NumPy arrays that web workers can memory-map and share. The 'mmap' format
+            supports TF-IDF + logistic regression models only.
+        slim (bool): Drop training-only state (see TRAINING_ONLY_ATTRIBUTES) from the pickle
+            to shrink the artifact and its load time. Predictions are unaffected.
         """
         if not self.is_trained:
             raise ValueError("Model is not trained yet. Call train() first.")
 
+        if artifact_format == 'mmap':
+            self._save_mmap_artifact(model_path)
+            print(f"Model saved to {model_path}")
+            return
+        elif artifact_format != 'pickle':
+            raise ValueError(f"Unknown artifact format: {artifact_format}")
+
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
         # Save model and vectorizer
         model_data = {
-            'model': self.model,
-            'vectorizer': self.vectorizer,
-            'model_type': self.model_type
+            'model': _strip_training_state(self.model) if slim else self.model,
+            'vectorizer': _strip_training_state(self.vectorizer) if slim else self.vectorizer,
+            'model_type': self.model_type,
+            'streaming': self.streaming
         }
 
         with open(model_path, 'wb') as f:
@@ -173,48 +594,371 @@ class SentimentModel:
         """
         Load a trained model and vectorizer.
 
+        The artifact format is detected automatically: a directory is read as an 'mmap'
+        artifact, anything else as a legacy pickle file.
+
         Parameters:
         model_path (str): Path to the saved model
         """
-        with open(model_path, 'rb') as f:
-            model_data = pickle.load(f)
+        if os.path.isdir(model_path):
+            self._load_mmap_artifact(model_path)
+        else:
+            with open(model_path, 'rb') as f:
+                model_data = pickle.load(f)
+
+            self.model = model_data['model']
+            self.vectorizer = model_data['vectorizer']
+            self.model_type = model_data['model_type']
+            self.streaming = model_data.get('streaming', False)
 
-        self.model = model_data['model']
-        self.vectorizer = model_data['vectorizer']
-        self.model_type = model_data['model_type']
         self.is_trained = True
+        self._build_scorer()
 
         print(f"Model loaded from {model_path}")
 
-def compare_models(df, text_column, sentiment_column):
+    def _save_mmap_artifact(self, artifact_dir):
+        """
+        Save the model as a JSON manifest, raw NumPy arrays and a vocabulary file.
+
+        Parameters:
+        artifact_dir (str): Directory to write the artifact to
+        """
+        if not CompiledLinearScorer.supports(self.vectorizer, self.model):
+            raise ValueError("The mmap artifact format only supports TF-IDF + binary logistic regression models.")
+
+        vectorizer_params = {}
+        for name, value in self.vectorizer.get_params().items():
+            if name in ('vocabulary', 'dtype'):
+                continue
+            if callable(value):
+                raise ValueError(f"Vectorizer parameter {name} is a callable and cannot be exported.")
+            if isinstance(value, (tuple, set, frozenset)):
+                value = list(value)
+            vectorizer_params[name] = value
+
+        terms = sorted(self.vectorizer.vocabulary_, key=self.vectorizer.vocabulary_.get)
+        if any('\n' in term for term in terms):
+            raise ValueError("Vocabulary terms containing newlines cannot be exported.")
+
+        os.makedirs(artifact_dir, exist_ok=True)
+        np.save(os.path.join(artifact_dir, 'idf.npy'), np.asarray(self.vectorizer.idf_, dtype=np.float64))
+        np.save(os.path.join(artifact_dir, 'coef.npy'), np.asarray(self.model.coef_, dtype=np.float64))
+        np.save(os.path.join(artifact_dir, 'intercept.npy'), np.asarray(self.model.intercept_, dtype=np.float64))
+        with open(os.path.join(artifact_dir, 'vocabulary.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(terms))
+
+        manifest = {
+            'format': MMAP_ARTIFACT_FORMAT,
+            'version': 1,
+            'model_type': self.model_type,
+            'classes': self.model.classes_.tolist(),
+            'vectorizer_params': vectorizer_params,
+            'vectorizer_dtype': np.dtype(self.vectorizer.dtype).name
+        }
+
+        # The manifest is written last so a partially written artifact is never loaded
+        with open(os.path.join(artifact_dir, MMAP_MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def _load_mmap_artifact(self, artifact_dir):
+        """
+        Load a model saved with save_model(artifact_format='mmap').
+
+        The numeric arrays are memory-mapped read-only, so processes loading the same
+        artifact share their physical pages.
+
+        Parameters:
+        artifact_dir (str): Directory containing the artifact
+        """
+        with open(os.path.join(artifact_dir, MMAP_MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != MMAP_ARTIFACT_FORMAT:
+            raise ValueError(f"{artifact_dir} does not contain a {MMAP_ARTIFACT_FORMAT} artifact")
+
+        with open(os.path.join(artifact_dir, 'vocabulary.txt'), 'r', encoding='utf-8') as f:
+            terms = f.read().split('\n')
+
+        params = manifest['vectorizer_params']
+        params['ngram_range'] = tuple(params['ngram_range'])
+        vectorizer = TfidfVectorizer(vocabulary=terms, dtype=np.dtype(manifest['vectorizer_dtype']).type, **params)
+        vectorizer.idf_ = np.load(os.path.join(artifact_dir, 'idf.npy'), mmap_mode='r')
+
+        model = LogisticRegression()
+        model.coef_ = np.load(os.path.join(artifact_dir, 'coef.npy'), mmap_mode='r')
+        model.intercept_ = np.load(os.path.join(artifact_dir, 'intercept.npy'), mmap_mode='r')
+        model.classes_ = np.array(manifest['classes'])
+        model.n_features_in_ = model.coef_.shape[1]
+
+        self.model = model
+        self.vectorizer = vectorizer
+        self.model_type = manifest['model_type']
+        self.streaming = False
+
+    def _build_scorer(self):
+        """
+        Precompile a fast single-text scorer if the trained pipeline supports it.
+        """
+        if CompiledLinearScorer.supports(self.vectorizer, self.model):
+            self.scorer = CompiledLinearScorer(self.vectorizer, self.model)
+        else:
+            self.scorer = None
+
+def _fit_and_evaluate(model_type, vectorizer, X_train_vectorized, y_train, X_test_vectorized, y_test,
+                      latency_samples=200):
+    """
+    Train and evaluate one candidate model on shared features, measuring its cost.
+
+    Parameters:
+    model_type (str): Type of model to train
+    vectorizer: Fitted vectorizer that produced the features
+    X_train_vectorized (scipy.sparse matrix): Vectorized training data
+    y_train (array-like): Training sentiment labels
+    X_test_vectorized (scipy.sparse matrix): Vectorized testing data
+    y_test (array-like): Testing sentiment labels
+    latency_samples (int): Number of test rows predicted one at a time to measure latency
+
+    Returns:
+    dict: Evaluation metrics plus fit time, single-review predict latency and artifact size
+    """
+    model = SentimentModel(model_type=model_type)
+    model.vectorizer = vectorizer
+
+    start_time = time.perf_counter()
+    model.train_vectorized(X_train_vectorized, y_train)
+    fit_time = time.perf_counter() - start_time
+
+    metrics = model.evaluate_vectorized(X_test_vectorized, y_test)
+
+    # Latency of scoring one already-vectorized review at a time, as the web app does
+    n_latency = min(latency_samples, X_test_vectorized.shape[0])
+    start_time = time.perf_counter()
+    for i in range(n_latency):
+        model.model.predict(X_test_vectorized[i])
+    predict_latency = (time.perf_counter() - start_time) / max(n_latency, 1)
+
+    # Size of the artifact save_model() would write
+    artifact = pickle.dumps({'model': model.model, 'vectorizer': vectorizer, 'model_type': model_type})
+
+    metrics['fit_time'] = fit_time
+    metrics['predict_latency_ms'] = predict_latency * 1000
+    metrics['artifact_size_kb'] = len(artifact) / 1024
+    return metrics
+
+def _fit_and_evaluate_stored(model_type, feature_dir):
+    """
+    Train and evaluate one candidate model on features memory-mapped from a FeatureStore.
+
+    Worker processes load the features themselves, so the matrices are shared through
+    the page cache instead of being pickled into every task.
+
+    Parameters:
+    model_type (str): Type of model to train
+    feature_dir (str): Directory of the FeatureStore holding the features
+
+    Returns:
+    dict: Metrics returned by _fit_and_evaluate()
+    """
+    from feature_store import FeatureStore
+
+    vectorizer, X_train_vectorized, X_test_vectorized, y_train, y_test = FeatureStore(feature_dir).load()
+    return _fit_and_evaluate(model_type, vectorizer, X_train_vectorized, y_train, X_test_vectorized, y_test)
+
+def compare_models(df, text_column, sentiment_column, feature_store=None, n_jobs=1, test_df=None):
     """
     Compare different sentiment analysis models.
 
+    The corpus is vectorized once and the same features are shared by every model.
+    With n_jobs > 1 the candidates are trained concurrently in a process pool; the
+    workers memory-map the features from the feature store (a temporary one if none
+    is given) rather than receiving a copy of the matrices.
+
     Parameters:
     df (pandas.DataFrame): Input dataframe
     text_column (str): Name of the column containing text
     sentiment_column (str): Name of the column containing sentiment labels
+    feature_store (FeatureStore): Optional store to load the features from, or to save
+        them to if it is empty
+    n_jobs (int): Maximum number of models trained at the same time (-1 trains all at once)
+    test_df (pandas.DataFrame): Held-out rows to evaluate on, e.g. a partition written by
+        split_data; if None, a stratified 20% of df is split off
 
     Returns:
-    dict: Dictionary containing evaluation results for each model
+    dict: Dictionary containing evaluation results and cost metrics for each model
     """
     model_types = ['logistic_regression', 'naive_bayes', 'svm', 'random_forest']
-    results = {}
 
-    # Prepare data
-    X_train, X_test, y_train, y_test = train_test_split(
-        df[text_column], df[sentiment_column], test_size=0.2, random_state=42, stratify=df[sentiment_column]
-    )
+    if feature_store is not None and feature_store.exists():
+        vectorizer, X_train_vectorized, X_test_vectorized, y_train, y_test = feature_store.load()
+    else:
+        # Prepare data
+        if test_df is not None:
+            X_train, y_train = df[text_column], df[sentiment_column]
+            X_test, y_test = test_df[text_column], test_df[sentiment_column]
+        else:
+            from sklearn.model_selection import train_test_split
 
-    for model_type in model_types:
-        print(f"Training and evaluating {model_type} model...")
-        model = SentimentModel(model_type=model_type)
-        model.train(X_train, y_train)
-        results[model_type] = model.evaluate(X_test, y_test)
+            X_train, X_test, y_train, y_test = train_test_split(
+                df[text_column], df[sentiment_column], test_size=0.2, random_state=42, stratify=df[sentiment_column]
+            )
+
+        # Vectorize once for all models
+        vectorizer = SentimentModel().vectorizer
+        X_train_vectorized = vectorizer.fit_transform(X_train)
+        X_test_vectorized = vectorizer.transform(X_test)
+
+        if feature_store is not None:
+            feature_store.save(vectorizer, X_train_vectorized, X_test_vectorized, y_train, y_test)
+
+    features = (vectorizer, X_train_vectorized, y_train, X_test_vectorized, y_test)
+
+    if n_jobs < 0:
+        n_jobs = len(model_types)
+    n_jobs = min(max(n_jobs, 1), len(model_types))
+
+    if n_jobs == 1:
+        results = {}
+        for model_type in model_types:
+            print(f"Training and evaluating {model_type} model...")
+            results[model_type] = _fit_and_evaluate(model_type, *features)
+        return results
+
+    import tempfile
+    from feature_store import FeatureStore
+
+    print(f"Training and evaluating {len(model_types)} models with {n_jobs} worker processes...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if feature_store is None:
+            feature_store = FeatureStore(tmp_dir)
+            feature_store.save(vectorizer, X_train_vectorized, X_test_vectorized, y_train, y_test)
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = {model_type: executor.submit(_fit_and_evaluate_stored, model_type, feature_store.feature_dir)
+                       for model_type in model_types}
+            return {model_type: future.result() for model_type, future in futures.items()}
+
+def write_comparison_report(results, report_path):
+    """
+    Write model comparison results, with a cost/accuracy summary table first.
+
+    Parameters:
+    results (dict): Results returned by compare_models()
+    report_path (str): Path of the report file
+    """
+    with open(report_path, 'w') as f:
+        f.write(f"{'Model':<22}{'Accuracy':>10}{'Fit time (s)':>14}{'Predict (ms)':>14}{'Artifact (KB)':>15}\n")
+        for model_type, metrics in results.items():
+            f.write(f"{model_type:<22}{metrics['accuracy']:>10.4f}{metrics['fit_time']:>14.2f}"
+                    f"{metrics['predict_latency_ms']:>14.3f}{metrics['artifact_size_kb']:>15.1f}\n")
+        f.write("\n")
+
+        for model_type, metrics in results.items():
+            f.write(f"Model: {model_type}\n")
+            f.write(f"Accuracy: {metrics['accuracy']:.4f}\n")
+            f.write(f"Fit time: {metrics['fit_time']:.2f} seconds\n")
+            f.write(f"Predict latency: {metrics['predict_latency_ms']:.3f} ms/review\n")
+            f.write(f"Artifact size: {metrics['artifact_size_kb']:.1f} KB\n")
+            f.write(f"Classification Report:\n{metrics['classification_report']}\n")
+            f.write(f"Confusion Matrix:\n{metrics['confusion_matrix']}\n\n")
+
+def vocabulary_sweep(X_train, y_train, X_test, y_test, sizes, method='chi2', model_type='logistic_regression',
+                     max_features=None, latency_samples=200, artifact_dir=None):
+    """
+    Train one model per vocabulary size, keeping the most discriminative terms, and measure each.
+
+    The vectorizer is fitted and the terms are ranked once; every size then keeps a
+    prefix of the same ranking. Each model is saved slim, as the app would load it,
+    so artifact size and load time are those of the deployed file.
+
+    Parameters:
+    X_train (pandas.Series): Training text data
+    y_train (pandas.Series): Training sentiment labels
+    X_test (pandas.Series): Testing text data
+    y_test (pandas.Series): Testing sentiment labels
+    sizes (list): Vocabulary sizes to try
+    method (str): Feature ranking method passed to SentimentModel.rank_features()
+    model_type (str): Type of model to train
+    max_features (int): Vocabulary size of the vectorizer before selection (the default of
+        SentimentModel if None)
+    latency_samples (int): Number of test reviews predicted one at a time to measure latency
+    artifact_dir (str): Directory to keep the saved models in (a temporary directory if None)
+
+    Returns:
+    dict: For each vocabulary size, evaluation metrics plus fit time, artifact size, load time,
+        single-review predict latency and, with artifact_dir, the artifact path
+    """
+    import tempfile
+
+    base = SentimentModel(model_type=model_type)
+    if max_features is not None:
+        base.vectorizer.set_params(max_features=max_features)
+    X_train_vectorized = base.vectorizer.fit_transform(X_train)
+    ranking = base.rank_features(X_train_vectorized, y_train, method=method)
+    print(f"Ranked {len(ranking)} terms by {method}")
+
+    latency_texts = list(X_test[:latency_samples])
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_dir = artifact_dir or tmp_dir
+        for size in sorted(set(min(size, len(ranking)) for size in sizes), reverse=True):
+            print(f"Training {model_type} with {size} terms...")
+            model = SentimentModel(model_type=model_type)
+            model.vectorizer = copy.deepcopy(base.vectorizer)
+            X_selected = model.select_features(ranking[:size], X_train_vectorized)
+
+            start_time = time.perf_counter()
+            model.train_vectorized(X_selected, y_train)
+            fit_time = time.perf_counter() - start_time
+
+            metrics = model.evaluate(X_test, y_test)
+
+            model_path = os.path.join(model_dir, f'{model_type}_vocabulary_{size}.pkl')
+            model.save_model(model_path, slim=True)
+            start_time = time.perf_counter()
+            loaded = SentimentModel()
+            loaded.load_model(model_path)
+            load_time = time.perf_counter() - start_time
+
+            # Latency of scoring one raw review at a time, as the web app does
+            start_time = time.perf_counter()
+            for text in latency_texts:
+                loaded.predict_with_score(text)
+            predict_latency = (time.perf_counter() - start_time) / max(len(latency_texts), 1)
+
+            metrics['vocabulary_size'] = size
+            metrics['fit_time'] = fit_time
+            metrics['artifact_size_kb'] = os.path.getsize(model_path) / 1024
+            metrics['load_time_ms'] = load_time * 1000
+            metrics['predict_latency_ms'] = predict_latency * 1000
+            if artifact_dir:
+                metrics['artifact_path'] = model_path
+            results[size] = metrics
 
     return results
 
+def write_vocabulary_report(results, report_path, min_accuracy=None):
+    """
+    Write vocabulary sweep results as an accuracy/cost table, smallest vocabulary first.
+
+    Parameters:
+    results (dict): Results returned by vocabulary_sweep()
+    report_path (str): Path of the report file
+    min_accuracy (float): Optional accuracy bar; sizes meeting it are marked
+    """
+    with open(report_path, 'w') as f:
+        f.write(f"{'Vocabulary':>10}{'Accuracy':>10}{'Artifact (KB)':>15}{'Load (ms)':>11}{'Predict (ms)':>14}\n")
+        for size in sorted(results):
+            metrics = results[size]
+            marker = ''
+            if min_accuracy is not None and metrics['accuracy'] >= min_accuracy:
+                marker = '  *'
+            f.write(f"{size:>10}{metrics['accuracy']:>10.4f}{metrics['artifact_size_kb']:>15.1f}"
+                    f"{metrics['load_time_ms']:>11.2f}{metrics['predict_latency_ms']:>14.3f}{marker}\n")
+        if min_accuracy is not None:
+            f.write(f"\n* meets the accuracy bar of {min_accuracy:.4f}\n")
+
 if __name__ == "__main__":
+    import pandas as pd
+
     # Example usage
     # Create a sample dataframe
     data = {
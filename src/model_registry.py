@@ -0,0 +1,248 @@
+import datetime
+import os
+import threading
+import time
+from model import SentimentModel, MMAP_MANIFEST
+
+# Sample reviews pushed through a freshly loaded model before it serves traffic. They are
+# already in the form TextPreprocessor.preprocess_text produces, so warming up a model never
+# loads NLTK: the app keeps its lazy preprocessor cold until the first real request
+WARMUP_REVIEWS = [
+    "product amazing work perfectly would buy",
+    "terrible quality broke two day support never answered",
+    "okay price nothing special job",
+    "absolutely love best purchase made year",
+    "waste money description completely misleading"
+]
+
+class ModelVersion:
+    """
+    A loaded and warmed model together with the metadata of its artifact.
+    """
+
+    def __init__(self, model, version, model_path, load_time, warmup_time):
+        """
+        Initialize the model version.
+
+        Parameters:
+        model (SentimentModel): Loaded model
+        version (int): Registry version number, incremented on every successful load
+        model_path (str): Path of the artifact the model was loaded from
+        load_time (float): Seconds spent loading the artifact
+        warmup_time (float): Seconds spent on warmup predictions
+        """
+        self.model = model
+        self.version = version
+        self.model_path = model_path
+        self.load_time = load_time
+        self.warmup_time = warmup_time
+        self.loaded_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def info(self):
+        """
+        Describe the model version as a JSON-serializable dictionary.
+        """
+        return {
+            'version': self.version,
+            'model_path': self.model_path,
+            'model_type': self.model.model_type,
+            'score_type': self.model.score_type,
+            'loaded_at': self.loaded_at,
+            'load_time_ms': round(self.load_time * 1000, 1),
+            'warmup_time_ms': round(self.warmup_time * 1000, 1)
+        }
+
+class ModelRegistry:
+    """
+    Holds the model served by the web app and replaces it without a restart.
+
+    A new artifact is loaded and warmed up while the current model keeps serving
+    requests; only then is the active version swapped, as a single reference
+    assignment. Request handlers take the active version once per request, so a
+    request never mixes two models. If loading fails the current model stays active.
+    """
+
+    def __init__(self, model_path, warmup_texts=None):
+        """
+        Initialize the registry.
+
+        Parameters:
+        model_path (str): Artifact path (a .pkl file or an mmap artifact directory)
+        warmup_texts (list): Preprocessed reviews used to warm up a new model
+        """
+        self.model_path = model_path
+        self.warmup_texts = WARMUP_REVIEWS if warmup_texts is None else warmup_texts
+        self.last_error = None
+        self._active = None
+        self._next_version = 1
+        self._loaded_signature = None
+        self._load_lock = threading.Lock()
+        self._reload_thread = None
+        self._watch_thread = None
+
+    def current(self):
+        """
+        Get the active model version.
+
+        Returns:
+        ModelVersion: Active version
+
+        Raises:
+        ValueError: If no model has been loaded
+        """
+        active = self._active
+        if active is None:
+            raise ValueError("No model loaded. Please train the model first using train_model.py.")
+        return active
+
+    @property
+    def is_loaded(self):
+        """
+        Whether a model version is active.
+        """
+        return self._active is not None
+
+    @property
+    def is_reloading(self):
+        """
+        Whether a background reload is in progress.
+        """
+        return self._reload_thread is not None and self._reload_thread.is_alive()
+
+    def load(self, model_path=None):
+        """
+        Load, warm up and activate a model artifact. Blocks until the swap is done.
+
+        Parameters:
+        model_path (str): Artifact to load (defaults to the registry's model path)
+
+        Returns:
+        ModelVersion: The newly active version
+        """
+        model_path = model_path or self.model_path
+
+        # Only one load at a time; requests keep using the active version meanwhile
+        with self._load_lock:
+            # Taken before loading, so a write that lands during the load is picked up by the watcher
+            signature = self._artifact_signature(model_path)
+            try:
+                start_time = time.perf_counter()
+                model = SentimentModel()
+                model.load_model(model_path)
+                load_time = time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                self._warm_up(model)
+                warmup_time = time.perf_counter() - start_time
+            except Exception as e:
+                self.last_error = f"Failed to load {model_path}: {e}"
+                print(self.last_error)
+                raise
+
+            new_version = ModelVersion(model, self._next_version, model_path, load_time, warmup_time)
+            self._next_version += 1
+            self.model_path = model_path
+            self._loaded_signature = signature
+            self.last_error = None
+            self._active = new_version
+
+        print(f"Model version {new_version.version} active ({load_time * 1000:.1f} ms load, "
+              f"{warmup_time * 1000:.1f} ms warmup)")
+        return new_version
+
+    def reload_async(self, model_path=None):
+        """
+        Load a model artifact in a background thread.
+
+        Parameters:
+        model_path (str): Artifact to load (defaults to the registry's model path)
+
+        Returns:
+        bool: False if a reload is already in progress
+        """
+        if self.is_reloading:
+            return False
+
+        def run():
+            try:
+                self.load(model_path)
+            except Exception:
+                pass  # recorded in last_error, the previous version stays active
+
+        self._reload_thread = threading.Thread(target=run, name='model-reload', daemon=True)
+        self._reload_thread.start()
+        return True
+
+    def watch(self, interval=5.0):
+        """
+        Reload the model whenever its artifact changes on disk.
+
+        A change is only picked up once the artifact has stayed unchanged for one
+        polling interval, so a file that is still being written is not loaded.
+
+        Parameters:
+        interval (float): Polling interval in seconds
+        """
+        if self._watch_thread is not None:
+            return
+
+        # load() records the signature of every artifact it activates, including explicit
+        # loads of another path, so the watcher only reacts to changes made after that
+        if self._loaded_signature is None:
+            self._loaded_signature = self._artifact_signature(self.model_path)
+
+        def run():
+            pending_signature = None
+            while True:
+                time.sleep(interval)
+                signature = self._artifact_signature(self.model_path)
+                if signature is None or signature == self._loaded_signature:
+                    pending_signature = None
+                elif signature != pending_signature:
+                    pending_signature = signature
+                else:
+                    try:
+                        self.load()
+                    except Exception:
+                        # Recorded in last_error, the previous version stays active; retry only
+                        # once the artifact changes again
+                        self._loaded_signature = signature
+                    pending_signature = None
+
+        self._watch_thread = threading.Thread(target=run, name='model-watch', daemon=True)
+        self._watch_thread.start()
+        print(f"Watching {self.model_path} for new model artifacts every {interval} seconds")
+
+    def info(self):
+        """
+        Describe the registry state as a JSON-serializable dictionary.
+        """
+        return {
+            'active': self._active.info() if self._active is not None else None,
+            'reloading': self.is_reloading,
+            'watching': self._watch_thread is not None,
+            'last_error': self.last_error
+        }
+
+    def _warm_up(self, model):
+        """
+        Run the preprocessed warmup reviews through the vectorizer, scorer and model.
+        """
+        texts = self.warmup_texts
+        if texts:
+            model.predict_batch(texts, return_scores=True)
+            model.predict_with_score(texts[0])
+
+    @staticmethod
+    def _artifact_signature(model_path):
+        """
+        Get a (modification time, size) signature of an artifact, or None if it is missing.
+        """
+        # An mmap artifact directory is complete once its manifest has been written
+        if os.path.isdir(model_path):
+            model_path = os.path.join(model_path, MMAP_MANIFEST)
+        try:
+            stat = os.stat(model_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,163 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Approximate per-entry overhead of the OrderedDict (hash table slot and linked-list node)
+ENTRY_OVERHEAD_BYTES = 100
+
+class PredictionCache:
+    """
+    A bounded LRU cache of prediction results with a time-to-live.
+
+    Results are stored under two kinds of keys: a digest of the raw review text,
+    which skips preprocessing entirely for exact duplicates, and a digest of the
+    preprocessed text, which catches near-duplicates that only differ in case,
+    punctuation, numbers or stop words. Keys are fixed-size digests, so long
+    reviews do not inflate the cache.
+
+    Every entry belongs to the model version that produced it. When a request
+    arrives with a different version, the cache is cleared first, so results of
+    a replaced model are never served.
+    """
+
+    def __init__(self, max_entries=100000, ttl_seconds=3600):
+        """
+        Initialize the cache.
+
+        Parameters:
+        max_entries (int): Maximum number of cached keys (0 disables the cache)
+        ttl_seconds (float): Seconds after which an entry expires (None for no expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_bytes = 0
+        self.hits = {'raw': 0, 'processed': 0}
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(text, kind='raw'):
+        """
+        Build the cache key of a text.
+
+        Parameters:
+        text (str): Raw review text, or its preprocessed form
+        kind (str): 'raw' or 'processed'
+
+        Returns:
+        tuple: (kind, 16-byte digest of the text)
+        """
+        return kind, hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def get(self, key, model_version):
+        """
+        Look up a cached result.
+
+        Parameters:
+        key (tuple): Key built with PredictionCache.key
+        model_version: Version of the model that would serve the request
+
+        Returns:
+        The cached result, or None on a miss
+        """
+        if not self.max_entries:
+            return None
+
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                # Lookups go raw key first, then processed key: only the second miss is a real miss
+                if key[0] == 'processed':
+                    self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits[key[0]] += 1
+            return entry[1]
+
+    def put(self, key, result, model_version):
+        """
+        Store a result.
+
+        Parameters:
+        key (tuple): Key built with PredictionCache.key
+        result: Prediction result to cache
+        model_version: Version of the model that produced the result
+        """
+        if not self.max_entries:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._check_version(model_version)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, result)
+            self.memory_bytes += self._entry_size(key, result)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+
+    def stats(self):
+        """
+        Describe the cache as a JSON-serializable dictionary.
+        """
+        with self._lock:
+            lookups = self.hits['raw'] + self.hits['processed'] + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'model_version': self.model_version,
+                'memory_bytes': self.memory_bytes,
+                'raw_hits': self.hits['raw'],
+                'processed_hits': self.hits['processed'],
+                'misses': self.misses,
+                'hit_rate': round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _check_version(self, model_version):
+        """
+        Drop all entries when the model version changes. Must be called with the lock held.
+        """
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.memory_bytes = 0
+            self.model_version = model_version
+
+    def _remove(self, key):
+        """
+        Remove one entry. Must be called with the lock held.
+        """
+        _, result = self._entries.pop(key)
+        self.memory_bytes -= self._entry_size(key, result)
+
+    @staticmethod
+    def _entry_size(key, result):
+        """
+        Approximate the memory held by one entry in bytes.
+        """
+        return ENTRY_OVERHEAD_BYTES + sys.getsizeof(key) + sys.getsizeof(key[1]) + sys.getsizeof(result)
@@ -1,14 +1,15 @@
 import pandas as pd
 import os
 import argparse
-from data_preprocessing import TextPreprocessor, load_data, create_sentiment_labels
-from model import SentimentModel, compare_models
+from data_preprocessing import TextPreprocessor, PreprocessedCorpusCache, load_data, iter_labeled_chunks, create_sentiment_labels
+from model import SentimentModel, compare_models, write_comparison_report
+from feature_store import FeatureStore
 from visualization import plot_sentiment_distribution, plot_rating_distribution, plot_word_cloud, save_figure
 
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Train sentiment analysis model on Amazon review data')
-    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV data file')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV or Parquet data file')
     parser.add_argument('--text_column', type=str, default='reviewText', help='Name of the text column')
     parser.add_argument('--rating_column', type=str, default='overall', help='Name of the rating column')
     parser.add_argument('--model_type', type=str, default='logistic_regression', 
@@ -16,28 +17,71 @@ def main():
                         help='Type of model to train')
     parser.add_argument('--output_dir', type=str, default='models', help='Directory to save the trained model')
     parser.add_argument('--compare', action='store_true', help='Compare different model types')
+    parser.add_argument('--n_jobs', type=int, default=1, help='Number of models trained in parallel when comparing (-1 for all)')
     parser.add_argument('--visualize', action='store_true', help='Generate visualizations')
+    parser.add_argument('--cache_dir', type=str, default='data/cache', help='Directory for cached preprocessed corpora')
+    parser.add_argument('--no_cache', action='store_true', help='Always recompute preprocessing and do not write the cache')
+    parser.add_argument('--test_path', type=str, default=None,
+                        help='Test partition written by split_data.py; --data_path is then used only for training')
 
     args = parser.parse_args()
 
     # Create output directory if it doesn't exist
     os.makedirs(args.output_dir, exist_ok=True)
 
-    # Load data
-    print(f"Loading data from {args.data_path}...")
-    df = load_data(args.data_path)
-    if df is None:
-        print("Failed to load data. Exiting.")
-        return
-
-    # Create sentiment labels
-    print("Creating sentiment labels...")
-    df_labeled = create_sentiment_labels(df, args.rating_column, args.text_column)
-
-    # Preprocess text
-    print("Preprocessing text data...")
     preprocessor = TextPreprocessor()
-    df_processed = preprocessor.preprocess_dataframe(df_labeled, args.text_column)
+
+    # Reuse the preprocessed corpus if this input file and configuration were seen before
+    cache = PreprocessedCorpusCache(args.cache_dir)
+    cache_path = cache.path_for(args.data_path, preprocessor, text_column=args.text_column,
+                                rating_column=args.rating_column)
+    df_processed = None if args.no_cache else cache.load(cache_path)
+
+    if df_processed is not None:
+        print(f"Loaded preprocessed data from cache {cache_path}")
+    else:
+        # Load data
+        print(f"Loading data from {args.data_path}...")
+        df = load_data(args.data_path, columns=[args.rating_column, args.text_column])
+        if df is None:
+            print("Failed to load data. Exiting.")
+            return
+
+        # Create sentiment labels
+        print("Creating sentiment labels...")
+        df_labeled = create_sentiment_labels(df, args.rating_column, args.text_column, inplace=True)
+
+        # Preprocess text
+        print("Preprocessing text data...")
+        df_processed = preprocessor.preprocess_dataframe(df_labeled, args.text_column, inplace=True)
+
+        if not args.no_cache:
+            cache.save(df_processed, cache_path, [args.rating_column, f'{args.text_column}_processed',
+                                                  'sentiment', 'sentiment_binary'])
+            print(f"Preprocessed data cached to {cache_path}")
+
+    # Load the test partition written by split_data.py instead of splitting the data in memory
+    test_processed = None
+    features_path = cache_path
+    if args.test_path:
+        test_cache_path = cache.path_for(args.test_path, preprocessor, text_column=args.text_column,
+                                         rating_column=args.rating_column)
+        test_processed = None if args.no_cache else cache.load(test_cache_path)
+        if test_processed is not None:
+            print(f"Loaded preprocessed test data from cache {test_cache_path}")
+        else:
+            print(f"Loading test data from {args.test_path}...")
+            test_processed = pd.concat(
+                iter_labeled_chunks(args.test_path, preprocessor, args.rating_column, args.text_column),
+                ignore_index=True
+            )
+            if not args.no_cache:
+                cache.save(test_processed, test_cache_path, [args.rating_column, f'{args.text_column}_processed',
+                                                             'sentiment', 'sentiment_binary'])
+                print(f"Preprocessed test data cached to {test_cache_path}")
+        # Features computed against this test partition are stored separately
+        features_path = cache.path_for(args.data_path, preprocessor, text_column=args.text_column,
+                                       rating_column=args.rating_column, test_path=test_cache_path)
 
     # Generate visualizations if requested
     if args.visualize:
@@ -52,7 +96,7 @@ def main():
         save_figure(sentiment_fig, os.path.join(viz_dir, 'sentiment_distribution.png'))
 
         # Plot rating distribution
-        rating_fig = plot_rating_distribution(df_labeled, args.rating_column)
+        rating_fig = plot_rating_distribution(df_processed, args.rating_column)
         save_figure(rating_fig, os.path.join(viz_dir, 'rating_distribution.png'))
 
         # Plot word cloud for positive reviews
@@ -68,32 +112,27 @@ def main():
     # Compare models if requested
     if args.compare:
         print("Comparing different models...")
-        results = compare_models(df_processed, f'{args.text_column}_processed', 'sentiment_binary')
+        # Features are stored next to the cached corpus they were computed from
+        feature_store = None if args.no_cache else FeatureStore(os.path.splitext(features_path)[0] + '_features')
+        results = compare_models(df_processed, f'{args.text_column}_processed', 'sentiment_binary',
+                                 feature_store=feature_store, n_jobs=args.n_jobs, test_df=test_processed)
 
         # Save comparison results
         comparison_file = os.path.join(args.output_dir, 'model_comparison.txt')
-        with open(comparison_file, 'w') as f:
-            for model_type, metrics in results.items():
-                f.write(f"Model: {model_type}
-")
-                f.write(f"Accuracy: {metrics['accuracy']:.4f}
-")
-                f.write(f"Classification Report:
-{metrics['classification_report']}
-")
-                f.write(f"Confusion Matrix:
-{metrics['confusion_matrix']}
-
-")
+        write_comparison_report(results, comparison_file)
 
         print(f"Model comparison results saved to {comparison_file}")
 
     # Train the specified model
     print(f"Training {args.model_type} model...")
     model = SentimentModel(model_type=args.model_type)
-    X_train, X_test, y_train, y_test = model.prepare_data(
-        df_processed, f'{args.text_column}_processed', 'sentiment_binary'
-    )
+    if test_processed is not None:
+        X_train, y_train = df_processed[f'{args.text_column}_processed'], df_processed['sentiment_binary']
+        X_test, y_test = test_processed[f'{args.text_column}_processed'], test_processed['sentiment_binary']
+    else:
+        X_train, X_test, y_train, y_test = model.prepare_data(
+            df_processed, f'{args.text_column}_processed', 'sentiment_binary'
+        )
     model.train(X_train, y_train)
 
     # Evaluate the model
@@ -107,16 +146,10 @@ def main():
     # Save evaluation results
     eval_file = os.path.join(args.output_dir, f'{args.model_type}_evaluation.txt')
     with open(eval_file, 'w') as f:
-        f.write(f"Model: {args.model_type}
-")
-        f.write(f"Accuracy: {results['accuracy']:.4f}
-")
-        f.write(f"Classification Report:
-{results['classification_report']}
-")
-        f.write(f"Confusion Matrix:
-{results['confusion_matrix']}
-")
+        f.write(f"Model: {args.model_type}\n")
+        f.write(f"Accuracy: {results['accuracy']:.4f}\n")
+        f.write(f"Classification Report:\n{results['classification_report']}\n")
+        f.write(f"Confusion Matrix:\n{results['confusion_matrix']}\n")
 
     print(f"Model evaluation results saved to {eval_file}")
     print("Training completed successfully!")
@@ -3,141 +3,157 @@ function reviewHistory() {
     return {
         filterSentiment: '',
         filterCategory: '',
+        filterSearch: '',
+        filterStartDate: '',
+        filterEndDate: '',
         currentPage: 1,
         itemsPerPage: 10,
         history: [],
-        filteredHistory: [],
+        // pageCursors[n] is the cursor that loads page n + 1 (null for the first page)
+        pageCursors: [null],
+        serverSummary: null,
 
         init() {
             this.loadHistory();
-            this.filterHistory();
+        },
+
+        get filterParams() {
+            return {
+                sentiment: this.filterSentiment,
+                category: this.filterCategory,
+                q: this.filterSearch,
+                start_date: this.filterStartDate,
+                end_date: this.filterEndDate
+            };
+        },
+
+        get hasFilters() {
+            return Object.values(this.filterParams).some(value => value);
         },
 
         async loadHistory() {
+            // Load the current page; filtering and pagination happen on the server
             try {
-                const response = await api.getReviewHistory();
-                if (response.success && response.history && response.history.length > 0) {
-                    this.history = response.history.map(review => ({
-                        ...review,
-                        expanded: false
-                    }));
-                } else {
-                    // Use mock data if no history is available
-                    this.history = [
-                        {
-                            id: 1,
-                            text: "This product exceeded my expectations! The quality is outstanding and it arrived earlier than expected. Highly recommend!",
-                            category: "Electronics",
-                            rating: 5,
-                            sentiment: "Positive",
-                            confidence: 0.92,
-                            date: new Date().toLocaleDateString()
-                        },
-                        {
-                            id: 2,
-                            text: "I'm very disappointed with this purchase. The product broke after just one week of use. Poor quality materials.",
-                            category: "Home & Kitchen",
-                            rating: 2,
-                            sentiment: "Negative",
-                            confidence: 0.87,
-                            date: new Date(Date.now() - 86400000).toLocaleDateString()
-                        },
-                        {
-                            id: 3,
-                            text: "Average product, nothing special. It does what it's supposed to do but the price is too high for what you get.",
-                            category: "Sports",
-                            rating: 3,
-                            sentiment: "Negative",
-                            confidence: 0.78,
-                            date: new Date(Date.now() - 172800000).toLocaleDateString()
-                        },
-                        {
-                            id: 4,
-                            text: "Absolutely love it! Best purchase I've made this year. The design is elegant and it works perfectly.",
-                            category: "Clothing",
-                            rating: 5,
-                            sentiment: "Positive",
-                            confidence: 0.95,
-                            date: new Date(Date.now() - 259200000).toLocaleDateString()
-                        },
-                        {
-                            id: 5,
-                            text: "Not worth the money. The product looks cheap and doesn't match the description at all.",
-                            category: "Books",
-                            rating: 1,
-                            sentiment: "Negative",
-                            confidence: 0.89,
-                            date: new Date(Date.now() - 345600000).toLocaleDateString()
-                        }
-                    ];
+                const response = await api.getReviewHistory({
+                    ...this.filterParams,
+                    limit: this.itemsPerPage,
+                    cursor: this.pageCursors[this.currentPage - 1]
+                });
+                if (!response.success) {
+                    throw new Error(response.error);
+                }
+                if (response.summary) {
+                    this.serverSummary = response.summary;
                 }
-                this.filterHistory();
+                if (response.history.length === 0 && this.currentPage === 1 && !this.hasFilters) {
+                    this.useMockHistory();
+                    return;
+                }
+                this.history = response.history.map(review => ({
+                    ...review,
+                    date: review.timestamp,
+                    expanded: false
+                }));
+                this.pageCursors[this.currentPage] = response.next_cursor;
             } catch (error) {
                 notifications.error('Error loading history: ' + error.message);
-                // Use mock data as fallback
-                this.history = [
-                    {
-                        id: 1,
-                        text: "This product exceeded my expectations! The quality is outstanding.",
-                        category: "Electronics",
-                        rating: 5,
-                        sentiment: "Positive",
-                        confidence: 0.92,
-                        date: new Date().toLocaleDateString()
-                    },
-                    {
-                        id: 2,
-                        text: "I'm very disappointed with this purchase. Poor quality materials.",
-                        category: "Home & Kitchen",
-                        rating: 2,
-                        sentiment: "Negative",
-                        confidence: 0.87,
-                        date: new Date(Date.now() - 86400000).toLocaleDateString()
-                    }
-                ];
-                this.filterHistory();
+                this.useMockHistory();
             }
         },
 
-        filterHistory() {
-            let filtered = [...this.history];
-
-            if (this.filterSentiment) {
-                filtered = filtered.filter(review => review.sentiment === this.filterSentiment);
-            }
-
-            if (this.filterCategory) {
-                filtered = filtered.filter(review => review.category === this.filterCategory);
-            }
+        useMockHistory() {
+            // Use mock data if no history is available
+            this.history = [
+                {
+                    id: 1,
+                    text: "This product exceeded my expectations! The quality is outstanding and it arrived earlier than expected. Highly recommend!",
+                    category: "Electronics",
+                    rating: 5,
+                    sentiment: "Positive",
+                    confidence: 0.92,
+                    date: new Date().toLocaleDateString()
+                },
+                {
+                    id: 2,
+                    text: "I'm very disappointed with this purchase. The product broke after just one week of use. Poor quality materials.",
+                    category: "Home & Kitchen",
+                    rating: 2,
+                    sentiment: "Negative",
+                    confidence: 0.87,
+                    date: new Date(Date.now() - 86400000).toLocaleDateString()
+                },
+                {
+                    id: 3,
+                    text: "Average product, nothing special. It does what it's supposed to do but the price is too high for what you get.",
+                    category: "Sports",
+                    rating: 3,
+                    sentiment: "Negative",
+                    confidence: 0.78,
+                    date: new Date(Date.now() - 172800000).toLocaleDateString()
+                },
+                {
+                    id: 4,
+                    text: "Absolutely love it! Best purchase I've made this year. The design is elegant and it works perfectly.",
+                    category: "Clothing",
+                    rating: 5,
+                    sentiment: "Positive",
+                    confidence: 0.95,
+                    date: new Date(Date.now() - 259200000).toLocaleDateString()
+                },
+                {
+                    id: 5,
+                    text: "Not worth the money. The product looks cheap and doesn't match the description at all.",
+                    category: "Books",
+                    rating: 1,
+                    sentiment: "Negative",
+                    confidence: 0.89,
+                    date: new Date(Date.now() - 345600000).toLocaleDateString()
+                }
+            ];
+            this.serverSummary = null;
+            this.pageCursors = [null, null];
+        },
 
-            this.filteredHistory = filtered;
+        filterHistory() {
+            // Filters changed: start again from the first page
             this.currentPage = 1;
+            this.pageCursors = [null];
+            this.serverSummary = null;
+            this.loadHistory();
         },
 
         get totalPages() {
-            return Math.ceil(this.filteredHistory.length / this.itemsPerPage);
+            return Math.max(1, Math.ceil(this.summary.total / this.itemsPerPage));
         },
 
         get paginatedHistory() {
-            const start = (this.currentPage - 1) * this.itemsPerPage;
-            const end = start + this.itemsPerPage;
-            return this.filteredHistory.slice(start, end);
+            return this.history;
         },
 
-        nextPage() {
-            if (this.currentPage < this.totalPages) {
+        async nextPage() {
+            if (this.currentPage < this.totalPages && this.pageCursors[this.currentPage]) {
                 this.currentPage++;
+                await this.loadHistory();
             }
         },
 
-        prevPage() {
+        async prevPage() {
             if (this.currentPage > 1) {
                 this.currentPage--;
+                await this.loadHistory();
             }
         },
 
-        goToPage(page) {
-            this.currentPage = page;
+        async goToPage(page) {
+            // Cursors are only known for pages already visited, so walk forward to later pages
+            while (this.currentPage < page && this.pageCursors[this.currentPage]) {
+                this.currentPage++;
+                await this.loadHistory();
+            }
+            if (page < this.currentPage) {
+                this.currentPage = page;
+                await this.loadHistory();
+            }
         },
 
         viewDetails(review) {
@@ -151,7 +167,6 @@ function reviewHistory() {
                     const response = await api.deleteReview(id);
                     if (response.success) {
                         notifications.success('Review deleted successfully');
-                        await this.loadHistory();
                         this.filterHistory();
                     } else {
                         notifications.error('Failed to delete review');
@@ -162,9 +177,25 @@ function reviewHistory() {
             }
         },
 
-        exportHistory() {
-            // Generate CSV from history data
-            const csv = this.generateCSV(this.filteredHistory);
+        async exportHistory() {
+            // Fetch every matching review page by page, then generate CSV from it
+            const reviews = [];
+            let cursor = null;
+            try {
+                do {
+                    const response = await api.getReviewHistory({ ...this.filterParams, limit: 500, cursor });
+                    if (!response.success) {
+                        throw new Error(response.error);
+                    }
+                    reviews.push(...response.history.map(review => ({ ...review, date: review.timestamp })));
+                    cursor = response.next_cursor;
+                } while (cursor);
+            } catch (error) {
+                notifications.error('Error exporting history: ' + error.message);
+                return;
+            }
+
+            const csv = this.generateCSV(reviews);
             const blob = new Blob([csv], { type: 'text/csv' });
             const url = URL.createObjectURL(blob);
             const a = document.createElement('a');
@@ -190,11 +221,21 @@ function reviewHistory() {
         },
 
         get summary() {
-            const total = this.filteredHistory.length;
-            const positive = this.filteredHistory.filter(r => r.sentiment === 'Positive').length;
-            const negative = this.filteredHistory.filter(r => r.sentiment === 'Negative').length;
+            // Totals over all matching reviews come from the server with the first page
+            if (this.serverSummary) {
+                return {
+                    total: this.serverSummary.total,
+                    positive: this.serverSummary.positive,
+                    negative: this.serverSummary.negative,
+                    avgConfidence: Math.round(this.serverSummary.average_confidence * 100)
+                };
+            }
+
+            const total = this.history.length;
+            const positive = this.history.filter(r => r.sentiment === 'Positive').length;
+            const negative = this.history.filter(r => r.sentiment === 'Negative').length;
             const avgConfidence = total > 0 
-                ? Math.round(this.filteredHistory.reduce((sum, r) => sum + r.confidence, 0) / total * 100)
+                ? Math.round(this.history.reduce((sum, r) => sum + r.confidence, 0) / total * 100)
                 : 0;
 
             return {
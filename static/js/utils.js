@@ -56,8 +56,12 @@ const api = {
         return await response.json();
     },
 
-    async getReviewHistory() {
-        const response = await fetch('/api/history');
+    async getReviewHistory(params = {}) {
+        // Drop empty filters so unfiltered requests share one URL (and one cached ETag)
+        const query = new URLSearchParams(
+            Object.entries(params).filter(([, value]) => value !== '' && value !== null && value !== undefined)
+        ).toString();
+        const response = await fetch(query ? `/api/history?${query}` : '/api/history');
         if (!response.ok) {
             throw new Error(`Server responded with status: ${response.status}`);
         }
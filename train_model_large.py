@@ -1,8 +1,7 @@
 
-import pandas as pd
 import os
 import argparse
-from data_preprocessing import TextPreprocessor, load_data, create_sentiment_labels
+from data_preprocessing import TextPreprocessor, SAMPLING_METHODS, load_sample, create_sentiment_labels, iter_labeled_chunks
 from model import SentimentModel
 import time
 import gc
@@ -10,7 +9,7 @@ import gc
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Train sentiment analysis model on Amazon review data')
-    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV data file')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV or Parquet data file')
     parser.add_argument('--text_column', type=str, default='Text', help='Name of the text column')
     parser.add_argument('--rating_column', type=str, default='Rating', help='Name of the rating column')
     parser.add_argument('--model_type', type=str, default='logistic_regression',
@@ -19,7 +18,16 @@ def main():
     parser.add_argument('--output_dir', type=str, default='models', help='Directory to save the trained model')
     parser.add_argument('--max_samples', type=int, default=2000000, help='Maximum number of samples to use')
     parser.add_argument('--batch_size', type=int, default=100000, help='Batch size for processing data')
+    parser.add_argument('--sampling', type=str, default='reservoir', choices=SAMPLING_METHODS,
+                        help='How max_samples rows are chosen: the first rows, a uniform random sample, or by content hash')
+    parser.add_argument('--random_state', type=int, default=42, help='Seed for sampling')
+    parser.add_argument('--test_path', type=str, default=None,
+                        help='Test partition written by split_data.py; --data_path is then used only for training')
     parser.add_argument('--max_features', type=int, default=20000, help='Maximum number of features for vectorizer')
+    parser.add_argument('--lemma_cache', type=str, default='models/lemma_cache.json', help='File used to warm and persist the lemma cache')
+    parser.add_argument('--fast_tokenize', action='store_true', help='Tokenize cleaned text with a whitespace split instead of word_tokenize')
+    parser.add_argument('--n_jobs', type=int, default=1, help='Number of preprocessing worker processes (-1 uses all CPU cores)')
+    parser.add_argument('--chunk_size', type=int, default=5000, help='Number of reviews sent to a preprocessing worker at a time')
 
     args = parser.parse_args()
 
@@ -28,48 +36,31 @@ def main():
 
     print(f"Loading data from {args.data_path}...")
 
-    # Load data in chunks to handle large datasets
-    chunks = []
-    for chunk in pd.read_csv(args.data_path, header=None, chunksize=args.batch_size):
-        chunk.columns = ['Rating', 'Title', 'Text']
-        chunks.append(chunk)
-
-        # Stop if we've reached max_samples
-        total_rows = sum(len(c) for c in chunks)
-        if total_rows >= args.max_samples:
-            # Trim the last chunk if needed
-            if total_rows > args.max_samples:
-                chunks[-1] = chunks[-1].iloc[:args.max_samples - (total_rows - len(chunks[-1]))]
-            break
-
-    # Concatenate all chunks
-    df = pd.concat(chunks, ignore_index=True)
+    # Stream the file in chunks, reading only the rating and text columns, and keep max_samples rows
+    df = load_sample(args.data_path, sample_size=args.max_samples, columns=[args.rating_column, args.text_column],
+                     method=args.sampling, chunksize=args.batch_size, random_state=args.random_state)
     print(f"Loaded {len(df)} records")
 
     # Create sentiment labels
     print("Creating sentiment labels...")
-    df_labeled = create_sentiment_labels(df, args.rating_column, args.text_column)
+    df_labeled = create_sentiment_labels(df, args.rating_column, args.text_column, inplace=True)
 
     # Preprocess text
     print("Preprocessing text data...")
-    preprocessor = TextPreprocessor()
+    preprocessor = TextPreprocessor(lemma_cache_path=args.lemma_cache, fast_tokenize=args.fast_tokenize)
 
-    # Process in batches to avoid memory issues
-    processed_chunks = []
-    for i in range(0, len(df_labeled), args.batch_size):
-        batch = df_labeled.iloc[i:i+args.batch_size].copy()
-        processed_batch = preprocessor.preprocess_dataframe(batch, args.text_column)
-        processed_chunks.append(processed_batch)
-        print(f"Processed {min(i+args.batch_size, len(df_labeled))} of {len(df_labeled)} records")
-
-        # Free memory
-        del batch
-        gc.collect()
+    # Process in chunks across worker processes; results stream back in row order
+    df_labeled[f'{args.text_column}_processed'] = preprocessor.preprocess_series(
+        df_labeled[args.text_column], n_jobs=args.n_jobs, chunk_size=args.chunk_size, report_every=args.batch_size
+    )
+    df_processed = df_labeled
 
-    df_processed = pd.concat(processed_chunks, ignore_index=True)
+    # Persist the lemma cache so the next run and the web app start warm
+    preprocessor.save_lemma_cache(args.lemma_cache)
+    print(f"Lemma cache: {preprocessor.lemma_cache.stats()}")
 
-    # Free memory
-    del processed_chunks
+    # Free memory: training only needs the processed text and labels
+    df_processed.drop(columns=[args.text_column], inplace=True)
     gc.collect()
 
     # Train the specified model with custom max_features
@@ -80,9 +71,13 @@ def main():
     from sklearn.feature_extraction.text import TfidfVectorizer
     model.vectorizer = TfidfVectorizer(max_features=args.max_features)
 
-    X_train, X_test, y_train, y_test = model.prepare_data(
-        df_processed, f'{args.text_column}_processed', 'sentiment_binary'
-    )
+    if args.test_path:
+        # The split is already on disk: train on every loaded row
+        X_train, y_train = df_processed[f'{args.text_column}_processed'], df_processed['sentiment_binary']
+    else:
+        X_train, X_test, y_train, y_test = model.prepare_data(
+            df_processed, f'{args.text_column}_processed', 'sentiment_binary'
+        )
 
     print(f"Training on {len(X_train)} samples...")
     start_time = time.time()
@@ -91,8 +86,19 @@ def main():
     print(f"Training completed in {training_time:.2f} seconds")
 
     # Evaluate the model
-    print("Evaluating model...")
-    metrics = model.evaluate(X_test, y_test)
+    if args.test_path:
+        # Stream the test partition so it is never held in memory as a whole
+        print(f"Evaluating model on {args.test_path}...")
+        metrics = model.evaluate_streaming(
+            iter_labeled_chunks(args.test_path, preprocessor, args.rating_column, args.text_column,
+                                chunksize=args.batch_size, n_jobs=args.n_jobs),
+            f'{args.text_column}_processed', 'sentiment_binary'
+        )
+        n_test = metrics['n_samples']
+    else:
+        print("Evaluating model...")
+        metrics = model.evaluate(X_test, y_test)
+        n_test = len(X_test)
 
     # Print evaluation results
     print(f"Model: {args.model_type}")
@@ -106,31 +112,22 @@ def main():
     model_path = os.path.join(args.output_dir, f'{args.model_type}_model_large.pkl')
     model.save_model(model_path)
 
-    # Also save as best_sentiment_model.pkl for compatibility with the app
+    # Also save as best_sentiment_model.pkl for compatibility with the app, without training-only state
     best_model_path = os.path.join(args.output_dir, 'best_sentiment_model.pkl')
-    model.save_model(best_model_path)
+    model.save_model(best_model_path, slim=True)
 
     # Save evaluation results
     eval_path = os.path.join(args.output_dir, f'{args.model_type}_evaluation_large.txt')
     with open(eval_path, 'w') as f:
-        f.write(f"Model: {args.model_type}
-")
-        f.write(f"Training samples: {len(X_train)}
-")
-        f.write(f"Testing samples: {len(X_test)}
-")
-        f.write(f"Training time: {training_time:.2f} seconds
-")
-        f.write(f"Max features: {args.max_features}
-")
-        f.write(f"Accuracy: {metrics['accuracy']:.4f}
-")
-        f.write("Classification Report:
-")
+        f.write(f"Model: {args.model_type}\n")
+        f.write(f"Training samples: {len(X_train)}\n")
+        f.write(f"Testing samples: {n_test}\n")
+        f.write(f"Training time: {training_time:.2f} seconds\n")
+        f.write(f"Max features: {args.max_features}\n")
+        f.write(f"Accuracy: {metrics['accuracy']:.4f}\n")
+        f.write("Classification Report:\n")
         f.write(metrics['classification_report'])
-        f.write("
-Confusion Matrix:
-")
+        f.write("\nConfusion Matrix:\n")
         f.write(str(metrics['confusion_matrix']))
 
     print(f"Model saved to {model_path}")
@@ -1,8 +1,7 @@
 
-import pandas as pd
 import os
 import argparse
-from data_preprocessing import TextPreprocessor, load_data, create_sentiment_labels
+from data_preprocessing import TextPreprocessor, PreprocessedCorpusCache, SAMPLING_METHODS, load_sample, create_sentiment_labels, iter_labeled_chunks
 from model import SentimentModel
 from visualization import plot_sentiment_distribution, plot_rating_distribution, plot_word_cloud, save_figure
 import time
@@ -10,7 +9,7 @@ import time
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Train sentiment analysis model on Amazon review data')
-    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV data file')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the CSV or Parquet data file')
     parser.add_argument('--text_column', type=str, default='Text', help='Name of the text column')
     parser.add_argument('--rating_column', type=str, default='Rating', help='Name of the rating column')
     parser.add_argument('--model_type', type=str, default='logistic_regression',
@@ -20,49 +19,55 @@ def main():
     parser.add_argument('--visualize', action='store_true', help='Generate visualizations')
     parser.add_argument('--max_samples', type=int, default=1000000, help='Maximum number of samples to use')
     parser.add_argument('--batch_size', type=int, default=100000, help='Batch size for processing data')
+    parser.add_argument('--sampling', type=str, default='reservoir', choices=SAMPLING_METHODS,
+                        help='How max_samples rows are chosen: the first rows, a uniform random sample, or by content hash')
+    parser.add_argument('--random_state', type=int, default=42, help='Seed for sampling')
+    parser.add_argument('--test_path', type=str, default=None,
+                        help='Test partition written by split_data.py; --data_path is then used only for training')
+    parser.add_argument('--cache_dir', type=str, default='data/cache', help='Directory for cached preprocessed corpora')
+    parser.add_argument('--no_cache', action='store_true', help='Always recompute preprocessing and do not write the cache')
 
     args = parser.parse_args()
 
     # Create output directory if it doesn't exist
     os.makedirs(args.output_dir, exist_ok=True)
 
-    print(f"Loading data from {args.data_path}...")
-
-    # Load data in chunks to handle large datasets
-    chunks = []
-    for chunk in pd.read_csv(args.data_path, header=None, chunksize=args.batch_size):
-        chunk.columns = ['Rating', 'Title', 'Text']
-        chunks.append(chunk)
-
-        # Stop if we've reached max_samples
-        total_rows = sum(len(c) for c in chunks)
-        if total_rows >= args.max_samples:
-            # Trim the last chunk if needed
-            if total_rows > args.max_samples:
-                chunks[-1] = chunks[-1].iloc[:args.max_samples - (total_rows - len(chunks[-1]))]
-            break
-
-    # Concatenate all chunks
-    df = pd.concat(chunks, ignore_index=True)
-    print(f"Loaded {len(df)} records")
-
-    # Create sentiment labels
-    print("Creating sentiment labels...")
-    df_labeled = create_sentiment_labels(df, args.rating_column, args.text_column)
-
-    # Preprocess text
-    print("Preprocessing text data...")
     preprocessor = TextPreprocessor()
 
-    # Process in batches to avoid memory issues
-    processed_chunks = []
-    for i in range(0, len(df_labeled), args.batch_size):
-        batch = df_labeled.iloc[i:i+args.batch_size].copy()
-        processed_batch = preprocessor.preprocess_dataframe(batch, args.text_column)
-        processed_chunks.append(processed_batch)
-        print(f"Processed {min(i+args.batch_size, len(df_labeled))} of {len(df_labeled)} records")
-
-    df_processed = pd.concat(processed_chunks, ignore_index=True)
+    # Reuse the preprocessed corpus if this input file and configuration were seen before
+    cache = PreprocessedCorpusCache(args.cache_dir)
+    cache_path = cache.path_for(args.data_path, preprocessor, text_column=args.text_column,
+                                rating_column=args.rating_column, max_samples=args.max_samples,
+                                sampling=args.sampling, random_state=args.random_state)
+    df_processed = None if args.no_cache else cache.load(cache_path)
+
+    if df_processed is not None:
+        print(f"Loaded preprocessed data from cache {cache_path}")
+    else:
+        print(f"Loading data from {args.data_path}...")
+
+        # Stream the file in chunks, reading only the rating and text columns, and keep max_samples rows
+        df = load_sample(args.data_path, sample_size=args.max_samples, columns=[args.rating_column, args.text_column],
+                         method=args.sampling, chunksize=args.batch_size, random_state=args.random_state)
+        print(f"Loaded {len(df)} records")
+
+        # Create sentiment labels
+        print("Creating sentiment labels...")
+        df_labeled = create_sentiment_labels(df, args.rating_column, args.text_column, inplace=True)
+
+        # Preprocess text
+        print("Preprocessing text data...")
+
+        # Process the text column in batches; only the processed column is added to the frame
+        df_labeled[f'{args.text_column}_processed'] = preprocessor.preprocess_series(
+            df_labeled[args.text_column], chunk_size=args.batch_size, report_every=args.batch_size
+        )
+        df_processed = df_labeled
+
+        if not args.no_cache:
+            cache.save(df_processed, cache_path, [args.rating_column, f'{args.text_column}_processed',
+                                                  'sentiment', 'sentiment_binary'])
+            print(f"Preprocessed data cached to {cache_path}")
 
     # Generate visualizations if requested
     if args.visualize:
@@ -77,7 +82,7 @@ def main():
         save_figure(sentiment_fig, os.path.join(viz_dir, 'sentiment_distribution.png'))
 
         # Plot rating distribution
-        rating_fig = plot_rating_distribution(df_labeled, args.rating_column)
+        rating_fig = plot_rating_distribution(df_processed, args.rating_column)
         save_figure(rating_fig, os.path.join(viz_dir, 'rating_distribution.png'))
 
         # Plot word cloud for positive reviews
@@ -93,9 +98,13 @@ def main():
     # Train the specified model
     print(f"Training {args.model_type} model...")
     model = SentimentModel(model_type=args.model_type)
-    X_train, X_test, y_train, y_test = model.prepare_data(
-        df_processed, f'{args.text_column}_processed', 'sentiment_binary'
-    )
+    if args.test_path:
+        # The split is already on disk: train on every loaded row
+        X_train, y_train = df_processed[f'{args.text_column}_processed'], df_processed['sentiment_binary']
+    else:
+        X_train, X_test, y_train, y_test = model.prepare_data(
+            df_processed, f'{args.text_column}_processed', 'sentiment_binary'
+        )
 
     print(f"Training on {len(X_train)} samples...")
     start_time = time.time()
@@ -104,8 +113,19 @@ def main():
     print(f"Training completed in {training_time:.2f} seconds")
 
     # Evaluate the model
-    print("Evaluating model...")
-    metrics = model.evaluate(X_test, y_test)
+    if args.test_path:
+        # Stream the test partition so it is never held in memory as a whole
+        print(f"Evaluating model on {args.test_path}...")
+        metrics = model.evaluate_streaming(
+            iter_labeled_chunks(args.test_path, preprocessor, args.rating_column, args.text_column,
+                                chunksize=args.batch_size),
+            f'{args.text_column}_processed', 'sentiment_binary'
+        )
+        n_test = metrics['n_samples']
+    else:
+        print("Evaluating model...")
+        metrics = model.evaluate(X_test, y_test)
+        n_test = len(X_test)
 
     # Print evaluation results
     print(f"Model: {args.model_type}")
@@ -126,22 +146,14 @@ def main():
     # Save evaluation results
     eval_path = os.path.join(args.output_dir, f'{args.model_type}_evaluation.txt')
     with open(eval_path, 'w') as f:
-        f.write(f"Model: {args.model_type}
-")
-        f.write(f"Training samples: {len(X_train)}
-")
-        f.write(f"Testing samples: {len(X_test)}
-")
-        f.write(f"Training time: {training_time:.2f} seconds
-")
-        f.write(f"Accuracy: {metrics['accuracy']:.4f}
-")
-        f.write("Classification Report:
-")
+        f.write(f"Model: {args.model_type}\n")
+        f.write(f"Training samples: {len(X_train)}\n")
+        f.write(f"Testing samples: {n_test}\n")
+        f.write(f"Training time: {training_time:.2f} seconds\n")
+        f.write(f"Accuracy: {metrics['accuracy']:.4f}\n")
+        f.write("Classification Report:\n")
         f.write(metrics['classification_report'])
-        f.write("
-Confusion Matrix:
-")
+        f.write("\nConfusion Matrix:\n")
         f.write(str(metrics['confusion_matrix']))
 
     print(f"Model saved to {model_path}")
@@ -0,0 +1,76 @@
+import os
+import sys
+import argparse
+sys.path.append('src')
+from data_preprocessing import TextPreprocessor, iter_labeled_chunks
+from model import SentimentModel
+import time
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Train a sentiment model out of core on Amazon review data')
+    parser.add_argument('--data_path', type=str, required=True, help='Path to the training CSV or Parquet data file')
+    parser.add_argument('--test_path', type=str, required=True, help='Path to the held-out CSV or Parquet data file')
+    parser.add_argument('--text_column', type=str, default='Text', help='Name of the text column')
+    parser.add_argument('--rating_column', type=str, default='Rating', help='Name of the rating column')
+    parser.add_argument('--model_type', type=str, default='logistic_regression',
+                        choices=['logistic_regression', 'naive_bayes'],
+                        help='Type of model to train')
+    parser.add_argument('--output_dir', type=str, default='models', help='Directory to save the trained model')
+    parser.add_argument('--max_samples', type=int, default=None, help='Maximum number of training samples (use all if not specified)')
+    parser.add_argument('--batch_size', type=int, default=100000, help='Number of rows held in memory at a time')
+    parser.add_argument('--n_features', type=int, default=2**20, help='Number of hashed features')
+    parser.add_argument('--n_jobs', type=int, default=1, help='Number of preprocessing worker processes (-1 uses all CPU cores)')
+    parser.add_argument('--fast_tokenize', action='store_true', help='Tokenize cleaned text with a whitespace split instead of word_tokenize')
+
+    args = parser.parse_args()
+
+    # Create output directory if it doesn't exist
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    preprocessor = TextPreprocessor(fast_tokenize=args.fast_tokenize)
+    processed_column = f'{args.text_column}_processed'
+
+    # Train chunk by chunk
+    print(f"Streaming training data from {args.data_path}...")
+    model = SentimentModel(model_type=args.model_type, streaming=True, n_features=args.n_features)
+    start_time = time.time()
+    n_train = model.train_streaming(
+        iter_labeled_chunks(args.data_path, preprocessor, args.rating_column, args.text_column,
+                            chunksize=args.batch_size, max_rows=args.max_samples, n_jobs=args.n_jobs),
+        processed_column, 'sentiment_binary'
+    )
+    training_time = time.time() - start_time
+    print(f"Training completed in {training_time:.2f} seconds")
+
+    # Evaluate chunk by chunk on the held-out file
+    print(f"Streaming evaluation data from {args.test_path}...")
+    metrics = model.evaluate_streaming(
+        iter_labeled_chunks(args.test_path, preprocessor, args.rating_column, args.text_column,
+                            chunksize=args.batch_size, n_jobs=args.n_jobs),
+        processed_column, 'sentiment_binary'
+    )
+
+    # Save the model
+    model_path = os.path.join(args.output_dir, f'{args.model_type}_model_streaming.pkl')
+    model.save_model(model_path)
+
+    # Save evaluation results
+    eval_path = os.path.join(args.output_dir, f'{args.model_type}_evaluation_streaming.txt')
+    with open(eval_path, 'w') as f:
+        f.write(f"Model: {args.model_type}\n")
+        f.write(f"Training samples: {n_train}\n")
+        f.write(f"Testing samples: {metrics['n_samples']}\n")
+        f.write(f"Training time: {training_time:.2f} seconds\n")
+        f.write(f"Hashed features: {args.n_features}\n")
+        f.write(f"Accuracy: {metrics['accuracy']:.4f}\n")
+        f.write("Classification Report:\n")
+        f.write(metrics['classification_report'])
+        f.write("\nConfusion Matrix:\n")
+        f.write(str(metrics['confusion_matrix']))
+
+    print(f"Evaluation results saved to {eval_path}")
+    print("Training completed successfully!")
+
+if __name__ == "__main__":
+    main()